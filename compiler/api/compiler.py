@@ -39,8 +39,28 @@ FLAGS_RE = re.compile(r"flags(\d?)\.(\d+)\?")
 FLAGS_RE_2 = re.compile(r"flags(\d?)\.(\d+)\?([\w<>.]+)")
 FLAGS_RE_3 = re.compile(r"flags(\d?):#")
 INT_RE = re.compile(r"int(\d+)")
+REFERENCE_RE = re.compile(r"raw\.(?:types|functions|base)\.([\w.]+)")
+IMPORT_RE = re.compile(r"from pyrogram\.raw\.(?:types|functions|base)(\.\w+)? import \(?([\w\s,]+)\)?")
 
 CORE_TYPES = ["int", "long", "int128", "int256", "double", "bytes", "string", "Bool", "true"]
+STRUCT_FORMATS = {"#": "i", "int": "i", "long": "q", "double": "d"}
+STRUCT_SIZES = {"#": 4, "int": 4, "long": 8, "double": 8}
+FIXED_SIZES = {"int": 4, "long": 8, "double": 8, "int128": 16, "int256": 32, "Bool": 4}
+
+ALL_OBJECTS = """
+
+class Objects(dict):
+    \"\"\"Constructor ID to class map, importing each class the first time its ID is looked up.\"\"\"
+
+    def __missing__(self, key: int) -> type:
+        path, name = paths[key].rsplit(".", 1)
+        obj = self[key] = getattr(import_module(path), name)
+
+        return obj
+
+
+objects = Objects()
+"""
 
 WARNING = """
 # # # # # # # # # # # # # # # # # # # # # # # #
@@ -199,8 +219,223 @@ def get_references(t: str, kind: str):
     return None, 0
 
 
+LAZY_SKIP_TMPL = """
+    @staticmethod
+    def skip(b: BytesIO, *args: Any) -> None:
+        {skip_types}
+"""
+
+LAZY_READ_TMPL = """
+    @staticmethod
+    def read_lazy(b: BytesIO, *args: Any) -> "{name}":
+        lazy = {{}}
+        {read_lazy_types}
+        return {name}({return_arguments}).defer(b, lazy)
+"""
+
+
+def get_lazy_read(arg_name: str, arg_type: str) -> str:
+    """Return the code that records and skips a nested object or vector of objects, if the field is one"""
+    flag = FLAGS_RE_2.match(arg_type)
+    field_type = flag.group(3) if flag else arg_type
+
+    if field_type in CORE_TYPES or field_type == "#":
+        return ""
+
+    if field_type == "Object":
+        # RPC results are decoded right away, though lazily themselves: they can be bare vectors, which can only be
+        # measured against the end of the message body they are part of
+        return f"\n        {arg_name} = TLObject.read_lazy(b)\n        "
+
+    if "vector" in field_type.lower():
+        if field_type.split("<")[1][:-1] in CORE_TYPES:
+            return ""
+
+        default, read_args, skip = "[]", "(TLObject,)", "TLObject.skip(b, TLObject)"
+    else:
+        default, read_args, skip = "None", "()", "TLObject.skip(b)"
+
+    code = f'lazy["{arg_name}"] = b.tell(), {read_args}\n{{indent}}{skip}'
+
+    if flag:
+        number, index, _ = flag.groups()
+        code = f"if flags{number} & (1 << {index}):\n{{indent}}" + code
+        indent = " " * 12
+    else:
+        indent = " " * 8
+
+    return f"\n        {arg_name} = {default}\n        " + code.format(indent=indent) + "\n        "
+
+
+def get_skip(c: Combinator) -> str:
+    """Return the body of a constructor skip method, which moves past its fields without decoding them"""
+    lines = []
+    seek = 0
+
+    for arg_name, arg_type in c.args:
+        flag = FLAGS_RE_2.match(arg_type)
+
+        if re.match(r"flags\d?", arg_name) and arg_type == "#":
+            if seek:
+                lines.append(f"b.seek({seek}, 1)")
+                seek = 0
+
+            lines.append(f"{arg_name} = Int.read(b)")
+            continue
+
+        field_type = flag.group(3) if flag else arg_type
+
+        if field_type == "true":
+            continue
+
+        if field_type in FIXED_SIZES and not flag:
+            seek += FIXED_SIZES[field_type]
+            continue
+
+        if seek:
+            lines.append(f"b.seek({seek}, 1)")
+            seek = 0
+
+        if field_type in FIXED_SIZES:
+            code = f"b.seek({FIXED_SIZES[field_type]}, 1)"
+        elif field_type in ("bytes", "string"):
+            code = "Bytes.skip(b)"
+        elif "vector" in field_type.lower():
+            sub_type = field_type.split("<")[1][:-1]
+            code = "TLObject.skip(b, {})".format(sub_type.title() if sub_type in CORE_TYPES else "TLObject")
+        else:
+            code = "TLObject.skip(b)"
+
+        if flag:
+            number, index, _ = flag.groups()
+            lines.append(f"if flags{number} & (1 << {index}):\n            {code}")
+        else:
+            lines.append(code)
+
+    if seek:
+        lines.append(f"b.seek({seek}, 1)")
+
+    return "\n        ".join(lines) or "pass"
+
+
+def get_size(c: Combinator) -> str:
+    """Return the body of a combinator _size method, which computes its encoded length without serializing it"""
+    size = 4  # Constructor ID
+    lines = []
+
+    for arg_name, arg_type in c.args:
+        flag = FLAGS_RE_2.match(arg_type)
+
+        if re.match(r"flags\d?", arg_name) and arg_type == "#":
+            size += 4
+            continue
+
+        field_type = flag.group(3) if flag else arg_type
+
+        if field_type == "true":
+            continue
+
+        if field_type in FIXED_SIZES and not flag:
+            size += FIXED_SIZES[field_type]
+            continue
+
+        if field_type in FIXED_SIZES:
+            code = f"size += {FIXED_SIZES[field_type]}"
+        elif field_type in ("bytes", "string"):
+            code = f"size += {field_type.title()}.size(self.{arg_name})"
+        elif "vector" in field_type.lower():
+            sub_type = field_type.split("<")[1][:-1]
+            code = "size += Vector.size(self.{}{})".format(
+                arg_name, f", {sub_type.title()}" if sub_type in CORE_TYPES else ""
+            )
+        else:
+            code = f"size += self.{arg_name}._size()"
+
+        if flag:
+            condition = f"self.{arg_name}" if "vector" in field_type.lower() else f"self.{arg_name} is not None"
+            lines.append(f"if {condition}:\n            {code}")
+        else:
+            lines.append(code)
+
+    return "\n        ".join([f"size = {size}"] + lines) + "\n\n        return size"
+
+
+def get_qualtype(arg_type: str) -> str:
+    """Return the qualified TL type an argument refers to, without flags and vectors"""
+    flag = FLAGS_RE_2.match(arg_type)
+    arg_type = flag.group(3) if flag else arg_type
+
+    if arg_type.lower().startswith("vector<"):
+        arg_type = arg_type.split("<")[1][:-1]
+
+    typespace, type = arg_type.split(".") if "." in arg_type else ("", arg_type)
+
+    return ".".join([typespace, camel(type)]).lstrip(".")
+
+
+def get_source_references(path: Path) -> List[str]:
+    """Return the raw types and functions referenced by the Python sources in path, outside of the raw package"""
+    references = []
+
+    for file in path.rglob("*.py"):
+        if "raw" in file.relative_to(path).parts[:1]:
+            continue
+
+        source = file.read_text(encoding="utf-8")
+
+        for match in REFERENCE_RE.findall(source):
+            parts = match.split(".")
+            references.append(".".join(parts[:2] if parts[0].islower() else parts[:1]))
+
+        for namespace, names in IMPORT_RE.findall(source):
+            for name in re.findall(r"\w+", names):
+                references.append(f"{namespace}.{name}".lstrip("."))
+
+    return references
+
+
+def get_profile(combinators: List[Combinator], entries: List[str]) -> List[Combinator]:
+    """Return the combinators named by a profile, together with every constructor they can reach.
+
+    Entries are function or constructor names, e.g.: "messages.sendMessage" or "messages.SendMessage", or type
+    names, e.g.: "InputPeer", which select all the constructors of that type. The closure follows argument types
+    of every selected combinator and result types of selected functions.
+    """
+    entries = {".".join(i.split(".")[:-1] + [camel(i.split(".")[-1])]) for i in entries}
+    constructors = {}
+
+    for c in combinators:
+        if c.section == "types":
+            constructors.setdefault(c.qualtype, []).append(c)
+
+    selected = [
+        c for c in combinators
+        if c.qualname in entries
+        or (c.section == "types" and c.qualtype in entries)
+    ]
+    queue = list(selected)
+    seen = {id(c) for c in selected}
+
+    while queue:
+        c = queue.pop()
+        reachable = [get_qualtype(t) for _, t in c.args]
+
+        if c.section == "functions":
+            reachable.append(get_qualtype(c.qualtype))
+
+        for t in reachable:
+            for i in constructors.get(t, []):
+                if id(i) not in seen:
+                    seen.add(id(i))
+                    queue.append(i)
+
+    return [c for c in combinators if id(c) in seen]
+
+
 # noinspection PyShadowingBuiltins
-def start(format: bool = False):
+def start(format: bool = False, profile: str = None):
+    profile = profile or os.environ.get("PYROGRAM_API_PROFILE")
+
     shutil.rmtree(DESTINATION_PATH / "types", ignore_errors=True)
     shutil.rmtree(DESTINATION_PATH / "functions", ignore_errors=True)
     shutil.rmtree(DESTINATION_PATH / "base", ignore_errors=True)
@@ -208,12 +443,15 @@ def start(format: bool = False):
     with open(HOME_PATH / "source/auth_key.tl") as f1, \
         open(HOME_PATH / "source/sys_msgs.tl") as f2, \
         open(HOME_PATH / "source/main_api.tl") as f3:
-        schema = (f1.read() + f2.read() + f3.read()).splitlines()
+        mtproto_schema = (f1.read() + f2.read()).splitlines()
+        schema = mtproto_schema + f3.read().splitlines()
 
     with open(HOME_PATH / "template/type.txt") as f1, \
-        open(HOME_PATH / "template/combinator.txt") as f2:
+        open(HOME_PATH / "template/combinator.txt") as f2, \
+        open(HOME_PATH / "template/namespace.txt") as f3:
         type_tmpl = f1.read()
         combinator_tmpl = f2.read()
+        namespace_tmpl = f3.read()
 
     with open(NOTICE_PATH, encoding="utf-8") as f:
         notice = []
@@ -278,6 +516,17 @@ def start(format: bool = False):
 
             combinators.append(combinator)
 
+    if profile:
+        with open(profile) as f:
+            entries = [i.split("#")[0].strip() for i in f.read().splitlines()]
+
+        # MTProto combinators and everything Pyrogram itself refers to are always part of a profile
+        mtproto = "\n".join(mtproto_schema)
+        entries += [c.qualname for c in combinators if f"#{c.id[2:]} " in mtproto]
+        entries += get_source_references(DESTINATION_PATH.parent)
+
+        combinators = get_profile(combinators, [i for i in entries if i])
+
     for c in combinators:
         qualtype = c.qualtype
 
@@ -447,9 +696,50 @@ def start(format: bool = False):
 
         write_types = read_types = "" if c.has_flags else "# No flags\n        "
 
+        # Consecutive fixed-width fields (and flag words) are decoded together with a single precompiled Struct
+        structs = []
+        run = []
+        deferred = ""
+
+        def flush_run() -> str:
+            nonlocal deferred
+
+            if len(run) > 1:
+                fmt = "<" + "".join(STRUCT_FORMATS[t] for _, t in run)
+                size = sum(STRUCT_SIZES[t] for _, t in run)
+                struct_name = f"_STRUCT_{len(structs)}"
+                structs.append(f'{struct_name} = Struct("{fmt}")')
+
+                code = f"\n        {', '.join(n for n, _ in run)} = {struct_name}.unpack(b.read({size}))\n        "
+            elif run:
+                n, t = run[0]
+                code = f"\n        {n} = {'Int' if t == '#' else t.title()}.read(b)\n        "
+            else:
+                code = ""
+
+            code += deferred
+            run.clear()
+            deferred = ""
+
+            return code
+
+        # The lazy reader shares the decoding code, except for nested objects and vectors of objects which are skipped
+        read_lazy_types = read_types
+        synced = len(read_types)
+
         for arg_name, arg_type in c.args:
             flag = FLAGS_RE_2.match(arg_type)
 
+            if arg_type in STRUCT_FORMATS and not flag:
+                run.append((arg_name, arg_type))
+            elif flag and flag.group(3) == "true" and run:
+                pass
+            else:
+                read_types += flush_run()
+
+            read_lazy_types += read_types[synced:]
+            synced = len(read_types)
+
             if re.match(r"flags\d?", arg_name) and arg_type == "#":
                 write_flags = []
 
@@ -469,11 +759,10 @@ def start(format: bool = False):
                 write_flags = "\n        ".join([
                     f"{arg_name} = 0",
                     "\n        ".join(write_flags),
-                    f"b.write(Int({arg_name}))\n        "
+                    f"b += Int({arg_name})\n        "
                 ])
 
                 write_types += write_flags
-                read_types += f"\n        {arg_name} = Int.read(b)\n        "
 
                 continue
 
@@ -481,12 +770,16 @@ def start(format: bool = False):
                 number, index, flag_type = flag.groups()
 
                 if flag_type == "true":
-                    read_types += "\n        "
-                    read_types += f"{arg_name} = True if flags{number} & (1 << {index}) else False"
+                    code = f"\n        {arg_name} = True if flags{number} & (1 << {index}) else False"
+
+                    if run:
+                        deferred += code
+                    else:
+                        read_types += code
                 elif flag_type in CORE_TYPES:
                     write_types += "\n        "
                     write_types += f"if self.{arg_name} is not None:\n            "
-                    write_types += f"b.write({flag_type.title()}(self.{arg_name}))\n        "
+                    write_types += f"b += {flag_type.title()}(self.{arg_name})\n        "
 
                     read_types += "\n        "
                     read_types += f"{arg_name} = {flag_type.title()}.read(b) if flags{number} & (1 << {index}) else None"
@@ -494,54 +787,78 @@ def start(format: bool = False):
                     sub_type = arg_type.split("<")[1][:-1]
 
                     write_types += "\n        "
-                    write_types += f"if self.{arg_name} is not None:\n            "
-                    write_types += "b.write(Vector(self.{}{}))\n        ".format(
+                    write_types += f"if self.{arg_name}:\n            "
+                    write_types += "Vector.extend(b, self.{}{})\n        ".format(
                         arg_name, f", {sub_type.title()}" if sub_type in CORE_TYPES else ""
                     )
 
                     read_types += "\n        "
                     read_types += "{} = TLObject.read(b{}) if flags{} & (1 << {}) else []\n        ".format(
-                        arg_name, f", {sub_type.title()}" if sub_type in CORE_TYPES else "", number, index
+                        arg_name, f", {sub_type.title()}" if sub_type in CORE_TYPES else ", TLObject", number, index
                     )
                 else:
                     write_types += "\n        "
                     write_types += f"if self.{arg_name} is not None:\n            "
-                    write_types += f"b.write(self.{arg_name}.write())\n        "
+                    write_types += f"self.{arg_name}.write_into(b)\n        "
 
                     read_types += "\n        "
                     read_types += f"{arg_name} = TLObject.read(b) if flags{number} & (1 << {index}) else None\n        "
             else:
                 if arg_type in CORE_TYPES:
                     write_types += "\n        "
-                    write_types += f"b.write({arg_type.title()}(self.{arg_name}))\n        "
+                    write_types += f"b += {arg_type.title()}(self.{arg_name})\n        "
 
-                    read_types += "\n        "
-                    read_types += f"{arg_name} = {arg_type.title()}.read(b)\n        "
+                    if arg_type not in STRUCT_FORMATS:
+                        read_types += "\n        "
+                        read_types += f"{arg_name} = {arg_type.title()}.read(b)\n        "
                 elif "vector" in arg_type.lower():
                     sub_type = arg_type.split("<")[1][:-1]
 
                     write_types += "\n        "
-                    write_types += "b.write(Vector(self.{}{}))\n        ".format(
+                    write_types += "Vector.extend(b, self.{}{})\n        ".format(
                         arg_name, f", {sub_type.title()}" if sub_type in CORE_TYPES else ""
                     )
 
                     read_types += "\n        "
                     read_types += "{} = TLObject.read(b{})\n        ".format(
-                        arg_name, f", {sub_type.title()}" if sub_type in CORE_TYPES else ""
+                        arg_name, f", {sub_type.title()}" if sub_type in CORE_TYPES else ", TLObject"
                     )
                 else:
                     write_types += "\n        "
-                    write_types += f"b.write(self.{arg_name}.write())\n        "
+                    write_types += f"self.{arg_name}.write_into(b)\n        "
 
                     read_types += "\n        "
                     read_types += f"{arg_name} = TLObject.read(b)\n        "
 
+            lazy = get_lazy_read(arg_name, arg_type)
+
+            if lazy:
+                read_lazy_types += lazy
+                synced = len(read_types)
+
+        read_types += flush_run()
+        read_lazy_types += read_types[synced:]
+        lazy_methods = ""
+        base = "TLObject"
+
+        if c.section == "types":
+            lazy_methods += LAZY_SKIP_TMPL.format(skip_types=get_skip(c))
+
+            if read_lazy_types != read_types:
+                base = "LazyObject"
+                lazy_methods += LAZY_READ_TMPL.format(
+                    name=c.name,
+                    read_lazy_types=read_lazy_types,
+                    return_arguments=", ".join([f"{i[0]}={i[0]}" for i in sorted_args])
+                )
+
         slots = ", ".join([f'"{i[0]}"' for i in sorted_args])
         return_arguments = ", ".join([f"{i[0]}={i[0]}" for i in sorted_args])
 
         compiled_combinator = combinator_tmpl.format(
             notice=notice,
             warning=WARNING,
+            structs="\n" + "\n".join(structs) + "\n" if structs else "",
             name=c.name,
             docstring=docstring,
             slots=slots,
@@ -550,6 +867,9 @@ def start(format: bool = False):
             arguments=arguments,
             fields=fields,
             read_types=read_types,
+            lazy_methods=lazy_methods,
+            size_types=get_size(c),
+            base=base,
             write_types=write_types,
             return_arguments=return_arguments
         )
@@ -575,10 +895,13 @@ def start(format: bool = False):
 
         d[c.namespace].append(c.name)
 
-    for namespace, types in namespaces_to_types.items():
-        with open(DESTINATION_PATH / "base" / namespace / "__init__.py", "w") as f:
-            f.write(f"{notice}\n\n")
-            f.write(f"{WARNING}\n\n")
+    for section, namespaces in (
+        ("base", namespaces_to_types),
+        ("types", namespaces_to_constructors),
+        ("functions", namespaces_to_functions)
+    ):
+        for namespace, types in namespaces.items():
+            modules = ""
 
             for t in types:
                 module = t
@@ -586,48 +909,26 @@ def start(format: bool = False):
                 if module == "Updates":
                     module = "UpdatesT"
 
-                f.write(f"from .{snake(module)} import {t}\n")
+                modules += f'\n    "{t}": "{snake(module)}",'
 
-            if not namespace:
-                f.write(f"from . import {', '.join(filter(bool, namespaces_to_types))}")
-
-    for namespace, types in namespaces_to_constructors.items():
-        with open(DESTINATION_PATH / "types" / namespace / "__init__.py", "w") as f:
-            f.write(f"{notice}\n\n")
-            f.write(f"{WARNING}\n\n")
-
-            for t in types:
-                module = t
-
-                if module == "Updates":
-                    module = "UpdatesT"
-
-                f.write(f"from .{snake(module)} import {t}\n")
-
-            if not namespace:
-                f.write(f"from . import {', '.join(filter(bool, namespaces_to_constructors))}\n")
-
-    for namespace, types in namespaces_to_functions.items():
-        with open(DESTINATION_PATH / "functions" / namespace / "__init__.py", "w") as f:
-            f.write(f"{notice}\n\n")
-            f.write(f"{WARNING}\n\n")
-
-            for t in types:
-                module = t
-
-                if module == "Updates":
-                    module = "UpdatesT"
-
-                f.write(f"from .{snake(module)} import {t}\n")
-
-            if not namespace:
-                f.write(f"from . import {', '.join(filter(bool, namespaces_to_functions))}")
+            with open(DESTINATION_PATH / section / namespace / "__init__.py", "w") as f:
+                f.write(namespace_tmpl.format(
+                    notice=notice,
+                    warning=WARNING.strip(),
+                    namespaces=(
+                        f"from . import {', '.join(filter(bool, namespaces))}\n"
+                        if not namespace else ""
+                    ),
+                    modules=modules,
+                    exports="".join(f'"{n}", ' for n in filter(bool, namespaces)) if not namespace else ""
+                ))
 
     with open(DESTINATION_PATH / "all.py", "w", encoding="utf-8") as f:
         f.write(notice + "\n\n")
         f.write(WARNING + "\n\n")
+        f.write("from importlib import import_module\n\n")
         f.write(f"layer = {layer}\n\n")
-        f.write("objects = {")
+        f.write("paths = {")
 
         for c in combinators:
             f.write(f'\n    {c.id}: "pyrogram.raw.{c.section}.{c.qualname}",')
@@ -642,6 +943,7 @@ def start(format: bool = False):
         f.write('\n    0x5bb8e511: "pyrogram.raw.core.Message",')
 
         f.write("\n}\n")
+        f.write(ALL_OBJECTS)
 
 
 if "__main__" == __name__:
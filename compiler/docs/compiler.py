@@ -189,6 +189,7 @@ def pyrogram_api():
             search_messages_count
             search_global
             search_global_count
+            search_local_messages
             download_media
             stream_media
             get_discussion_message
@@ -328,6 +329,7 @@ def pyrogram_api():
         advanced="""
         Advanced
             invoke
+            invoke_ordered
             resolve_peer
             save_file
         """
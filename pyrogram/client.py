@@ -25,6 +25,8 @@ import platform
 import re
 import shutil
 import sys
+import time
+from collections import OrderedDict
 from concurrent.futures.thread import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from hashlib import sha256
@@ -47,16 +49,18 @@ from pyrogram.errors import (
     BadRequest
 )
 from pyrogram.handlers.handler import Handler
+from pyrogram.raw.core import UnknownObject
 from pyrogram.methods import Methods
 from pyrogram.session import Auth, Session
-from pyrogram.storage import FileStorage, MemoryStorage
+from pyrogram.storage import FileStorage, MemoryStorage, MessageStore, MessageIndex
 from pyrogram.types import User, TermsOfService
 from pyrogram.utils import ainput
 from .dispatcher import Dispatcher
 from .file_id import FileId, FileType, ThumbnailSource
 from .mime_types import mime_types
 from .parser import Parser
-from .session.internals import MsgId
+from .resolver import Resolver
+from .session.internals import MsgId, FloodWaitRegistry
 
 log = logging.getLogger(__name__)
 
@@ -177,6 +181,57 @@ class Client(Methods):
             Set the maximum amount of concurrent transmissions (uploads & downloads).
             A value that is too high may result in network related issues.
             Defaults to 1.
+
+        store_messages (``bool``, *optional*):
+            Pass True to keep the messages received by this client in a persistent local store.
+            Stored messages are used to resolve replied-to messages, callback query messages and media groups without
+            having to fetch them again from Telegram.
+            The store is kept in a "<name>.messages" file inside the working directory, or in memory for in-memory
+            sessions.
+            Defaults to False.
+
+        index_messages (``bool``, *optional*):
+            Pass True to keep a local full-text index of the texts and captions of received messages, which can be
+            queried with :meth:`~pyrogram.Client.search_local_messages`.
+            The index is kept in a "<name>.index" file inside the working directory, or in memory for in-memory
+            sessions. Requires SQLite with FTS5 support.
+            Defaults to False.
+
+        index_tokenizer (``str``, *optional*):
+            The FTS5 tokenizer used by the local message index, e.g.: "trigram" or "porter unicode61".
+            Defaults to "unicode61 remove_diacritics 2".
+
+        lazy_decoding (``bool``, *optional*):
+            Pass True to decode nested raw objects and vectors of incoming messages only when they are first
+            accessed. Ignored updates are then only scanned instead of being fully decoded.
+            Defaults to False.
+
+        main_sessions (``int``, *optional*):
+            Number of sessions to open on the home DC. Sessions share the same authorization but have their own
+            connection, and API calls are spread across them according to how many requests each one is waiting on.
+            Only the first session receives updates. Useful for bulk workloads which would otherwise be limited by a
+            single connection.
+            Defaults to 1.
+
+        coalesce_requests (``bool``, *optional*):
+            Pass True to let concurrent identical calls of read-only functions (such as getting users, chats, chat
+            members or messages) share a single request and its response, instead of each sending its own.
+            Responses are then shared between callers and should not be modified.
+            Defaults to False.
+
+        message_cache_ttl (``float``, *optional*):
+            Seconds after which messages kept in the in-memory message cache expire.
+            Defaults to None (cached messages never expire).
+
+        message_cache_max_size (``int``, *optional*):
+            Approximate memory budget of the in-memory message cache, in bytes. The least recently used messages are
+            evicted once it is exceeded.
+            Defaults to None (no budget, only the number of cached messages is limited).
+
+        message_cache_chat_capacity (``int``, *optional*):
+            Maximum number of messages of a single chat kept in the in-memory message cache, so that a busy chat
+            can't evict the messages of all the others.
+            Defaults to None (no per-chat limit).
     """
 
     APP_VERSION = f"Pyrogram {__version__}"
@@ -196,6 +251,13 @@ class Client(Methods):
 
     MAX_CONCURRENT_TRANSMISSIONS = 1
 
+    MAIN_SESSIONS = 1
+
+    MESSAGE_CACHE_CAPACITY = 10000
+    MESSAGE_CACHE_TTL = None
+    MESSAGE_CACHE_MAX_SIZE = None
+    MESSAGE_CACHE_CHAT_CAPACITY = None
+
     mimetypes = MimeTypes()
     mimetypes.readfp(StringIO(mime_types))
 
@@ -225,7 +287,16 @@ class Client(Methods):
         takeout: bool = None,
         sleep_threshold: int = Session.SLEEP_THRESHOLD,
         hide_password: bool = False,
-        max_concurrent_transmissions: int = MAX_CONCURRENT_TRANSMISSIONS
+        max_concurrent_transmissions: int = MAX_CONCURRENT_TRANSMISSIONS,
+        store_messages: bool = False,
+        index_messages: bool = False,
+        index_tokenizer: str = MessageIndex.TOKENIZE,
+        lazy_decoding: bool = False,
+        main_sessions: int = MAIN_SESSIONS,
+        coalesce_requests: bool = False,
+        message_cache_ttl: float = MESSAGE_CACHE_TTL,
+        message_cache_max_size: int = MESSAGE_CACHE_MAX_SIZE,
+        message_cache_chat_capacity: int = MESSAGE_CACHE_CHAT_CAPACITY
     ):
         super().__init__()
 
@@ -254,6 +325,15 @@ class Client(Methods):
         self.sleep_threshold = sleep_threshold
         self.hide_password = hide_password
         self.max_concurrent_transmissions = max_concurrent_transmissions
+        self.store_messages = store_messages
+        self.index_messages = index_messages
+        self.index_tokenizer = index_tokenizer
+        self.lazy_decoding = lazy_decoding
+        self.main_sessions = main_sessions
+        self.coalesce_requests = coalesce_requests
+        self.message_cache_ttl = message_cache_ttl
+        self.message_cache_max_size = message_cache_max_size
+        self.message_cache_chat_capacity = message_cache_chat_capacity
 
         self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix="Handler")
 
@@ -264,14 +344,42 @@ class Client(Methods):
         else:
             self.storage = FileStorage(self.name, self.workdir)
 
+        if self.store_messages:
+            self.message_store = MessageStore(
+                ":memory:" if self.session_string or self.in_memory
+                else str(self.workdir / (self.name + MessageStore.FILE_EXTENSION))
+            )
+        else:
+            self.message_store = None
+
+        if self.index_messages:
+            self.message_index = MessageIndex(
+                ":memory:" if self.session_string or self.in_memory
+                else str(self.workdir / (self.name + MessageIndex.FILE_EXTENSION)),
+                self.index_tokenizer
+            )
+        else:
+            self.message_index = None
+
         self.dispatcher = Dispatcher(self)
 
+        self.resolver = Resolver(self)
+
         self.rnd_id = MsgId
 
         self.parser = Parser(self)
 
         self.session = None
 
+        # Additional sessions on the home DC, which are only started once the client is initialized
+        self.session_pool = []
+
+        # In-flight coalesced requests, by serialized query
+        self.inflight_requests = {}
+
+        # Flood waits shared by all sessions, with their statistics by method
+        self.flood_waits = FloodWaitRegistry()
+
         self.media_sessions = {}
         self.media_sessions_lock = asyncio.Lock()
 
@@ -283,11 +391,19 @@ class Client(Methods):
 
         self.takeout_id = None
 
+        # The (pts, date) of the common update box, which updates that can't be decoded are fetched back from
+        self.updates_state = None
+
         self.disconnect_handler = None
 
         self.me: Optional[User] = None
 
-        self.message_cache = Cache(10000)
+        self.message_cache = Cache(
+            self.MESSAGE_CACHE_CAPACITY,
+            ttl=self.message_cache_ttl,
+            max_size=self.message_cache_max_size,
+            chat_capacity=self.message_cache_chat_capacity
+        )
 
         # Sometimes, for some reason, the server will stop sending updates and will only respond to pings.
         # This watchdog will invoke updates.GetState in order to wake up the server and enable it sending updates again
@@ -556,6 +672,9 @@ class Client(Methods):
                 pts = getattr(update, "pts", None)
                 pts_count = getattr(update, "pts_count", None)
 
+                if pts is not None and channel_id is None:
+                    self.updates_state = pts, updates.date
+
                 if isinstance(update, raw.types.UpdateChannelTooLong):
                     log.info(update)
 
@@ -586,6 +705,8 @@ class Client(Methods):
 
                 self.dispatcher.updates_queue.put_nowait((update, users, chats))
         elif isinstance(updates, (raw.types.UpdateShortMessage, raw.types.UpdateShortChatMessage)):
+            self.updates_state = updates.pts, updates.date
+
             diff = await self.invoke(
                 raw.functions.updates.GetDifference(
                     pts=updates.pts - updates.pts_count,
@@ -611,6 +732,48 @@ class Client(Methods):
             self.dispatcher.updates_queue.put_nowait((updates.update, {}, {}))
         elif isinstance(updates, raw.types.UpdatesTooLong):
             log.info(updates)
+        elif isinstance(updates, UnknownObject):
+            # The whole batch is lost, as its elements can't be measured without their constructors being known
+            log.warning("Unable to decode updates with constructor %08x", updates.ID)
+
+            if self.updates_state is not None:
+                await self.fetch_difference()
+
+    async def fetch_difference(self):
+        while True:
+            pts, date = self.updates_state
+
+            diff = await self.invoke(raw.functions.updates.GetDifference(pts=pts, date=date, qts=-1))
+
+            if isinstance(diff, raw.types.updates.DifferenceEmpty):
+                self.updates_state = pts, diff.date
+                return
+
+            if not isinstance(diff, (raw.types.updates.Difference, raw.types.updates.DifferenceSlice)):
+                log.info(diff)
+                return
+
+            state = diff.state if isinstance(diff, raw.types.updates.Difference) else diff.intermediate_state
+            self.updates_state = state.pts, state.date
+
+            await self.fetch_peers(diff.users)
+            await self.fetch_peers(diff.chats)
+
+            users = {u.id: u for u in diff.users}
+            chats = {c.id: c for c in diff.chats}
+
+            for message in diff.new_messages:
+                self.dispatcher.updates_queue.put_nowait((
+                    raw.types.UpdateNewMessage(message=message, pts=state.pts, pts_count=0),
+                    users,
+                    chats
+                ))
+
+            for update in diff.other_updates:
+                self.dispatcher.updates_queue.put_nowait((update, users, chats))
+
+            if isinstance(diff, raw.types.updates.Difference):
+                return
 
     async def load_session(self):
         await self.storage.open()
@@ -868,7 +1031,8 @@ class Client(Methods):
                 if dc_id != await self.storage.dc_id()
                 else await self.storage.auth_key(),
                 await self.storage.test_mode(),
-                is_media=True
+                is_media=True,
+                zero_copy=True
             )
 
             try:
@@ -1030,19 +1194,158 @@ class Client(Methods):
 
 
 class Cache:
-    def __init__(self, capacity: int):
+    """Least recently used cache of parsed objects.
+
+    Keys are expected to be ``(chat_id, message_id)`` tuples when *chat_capacity* is used.
+
+    Parameters:
+        capacity (``int``):
+            Maximum number of entries.
+
+        ttl (``float``, *optional*):
+            Seconds after which an entry expires. Defaults to None (entries never expire).
+
+        max_size (``int``, *optional*):
+            Approximate memory budget in bytes, as estimated by :meth:`get_size`. Defaults to None (no budget).
+
+        chat_capacity (``int``, *optional*):
+            Maximum number of entries kept for a single chat. Defaults to None (no per-chat limit).
+    """
+
+    def __init__(self, capacity: int, ttl: float = None, max_size: int = None, chat_capacity: int = None):
         self.capacity = capacity
-        self.store = {}
+        self.ttl = ttl
+        self.max_size = max_size
+        self.chat_capacity = chat_capacity
+
+        self.store = OrderedDict()  # key -> (value, size, expires_at)
+        self.chats = {}  # chat_id -> OrderedDict of keys, least recently used first
+        self.size = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def get_size(obj, seen: set = None) -> int:
+        """Roughly estimate the memory used by an object, including the objects it references"""
+        if seen is None:
+            seen = set()
+
+        if id(obj) in seen:
+            return 0
+
+        seen.add(id(obj))
+        size = sys.getsizeof(obj)
+
+        if isinstance(obj, pyrogram.types.Object):
+            size += sum(
+                Cache.get_size(v, seen)
+                for k, v in obj.__dict__.items()
+                if not k.startswith("_") and v is not None
+            )
+        elif isinstance(obj, (list, tuple)):
+            size += sum(Cache.get_size(i, seen) for i in obj)
+        elif isinstance(obj, dict):
+            size += sum(Cache.get_size(i, seen) for i in obj.values())
+
+        return size
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def __contains__(self, key) -> bool:
+        entry = self.store.get(key, None)
+        return entry is not None and not self.is_expired(entry)
 
     def __getitem__(self, key):
-        return self.store.get(key, None)
+        entry = self.store.get(key, None)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if self.is_expired(entry):
+            self.remove(key)
+            self.misses += 1
+            return None
+
+        self.store.move_to_end(key)
+
+        chat = self.chats.get(self.get_chat_id(key), None)
+
+        if chat is not None:
+            chat.move_to_end(key)
+
+        self.hits += 1
+
+        return entry[0]
 
     def __setitem__(self, key, value):
         if key in self.store:
-            del self.store[key]
+            self.remove(key)
+
+        size = self.get_size(value) if self.max_size is not None else 0
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+
+        self.store[key] = (value, size, expires_at)
+        self.size += size
+
+        chat_id = self.get_chat_id(key)
+
+        if self.chat_capacity is not None and chat_id is not None:
+            chat = self.chats.setdefault(chat_id, OrderedDict())
+            chat[key] = None
+
+            while len(chat) > self.chat_capacity:
+                self.evict(next(iter(chat)))
+
+        while len(self.store) > self.capacity or (self.max_size is not None and self.size > self.max_size):
+            if len(self.store) == 1:
+                break
+
+            self.evict(next(iter(self.store)))
+
+    def pop(self, key, default=None):
+        entry = self.store.get(key, None)
+
+        if entry is None:
+            return default
+
+        self.remove(key)
+
+        return entry[0]
+
+    def clear(self):
+        self.store.clear()
+        self.chats.clear()
+        self.size = 0
+
+    def is_expired(self, entry) -> bool:
+        return entry[2] is not None and entry[2] <= time.monotonic()
+
+    @staticmethod
+    def get_chat_id(key):
+        return key[0] if isinstance(key, tuple) else None
+
+    def evict(self, key):
+        self.remove(key)
+        self.evictions += 1
+
+    def remove(self, key):
+        _, size, _ = self.store.pop(key)
+        self.size -= size
+
+        chat_id = self.get_chat_id(key)
+        chat = self.chats.get(chat_id, None)
 
-        self.store[key] = value
+        if chat is not None:
+            chat.pop(key, None)
 
-        if len(self.store) > self.capacity:
-            for _ in range(self.capacity // 2 + 1):
-                del self.store[next(iter(self.store))]
+            if not chat:
+                del self.chats[chat_id]
@@ -21,7 +21,7 @@ from io import BytesIO
 from os import urandom
 
 from pyrogram.errors import SecurityCheckMismatch
-from pyrogram.raw.core import Message, Long
+from pyrogram.raw.core import BufferReader, GzipPacked, Int, Long, Message, MsgContainer
 from . import aes
 
 
@@ -38,36 +38,59 @@ def kdf(auth_key: bytes, msg_key: bytes, outgoing: bool) -> tuple:
     return aes_key, aes_iv
 
 
-def pack(message: Message, salt: int, session_id: bytes, auth_key: bytes, auth_key_id: bytes) -> bytes:
-    data = Long(salt) + session_id + message.write()
-    padding = urandom(-(len(data) + 12) % 16 + 12)
+def pack(
+    message: Message,
+    salt: int,
+    session_id: bytes,
+    auth_key: bytes,
+    auth_key_id: bytes,
+    gzip_threshold: int = 0
+) -> bytes:
+    data = bytearray(Long(salt))
+    data += session_id
+    message.write_into(data)
+
+    # Large bodies are sent gzip packed, as long as that actually makes them smaller
+    if gzip_threshold and message.length >= gzip_threshold and not isinstance(message.body, MsgContainer):
+        with memoryview(data) as view:
+            # Skip salt (8) + session_id (8) + msg_id (8) + seq_no (4) + length (4) to get the body
+            packed = GzipPacked.pack(view[32:])
+
+        if len(packed) < message.length:
+            message.length = len(packed)
+            data[28:] = Int(message.length) + packed
+    data += urandom(-(len(data) + 12) % 16 + 12)  # Padding
 
     # 88 = 88 + 0 (outgoing message)
-    msg_key_large = sha256(auth_key[88: 88 + 32] + data + padding).digest()
-    msg_key = msg_key_large[8:24]
+    msg_key_large = sha256(auth_key[88: 88 + 32])
+    msg_key_large.update(data)
+    msg_key = msg_key_large.digest()[8:24]
     aes_key, aes_iv = kdf(auth_key, msg_key, True)
 
-    return auth_key_id + msg_key + aes.ige256_encrypt(data + padding, aes_key, aes_iv)
+    return auth_key_id + msg_key + aes.ige256_encrypt(bytes(data), aes_key, aes_iv)
 
 
 def unpack(
     b: BytesIO,
     session_id: bytes,
     auth_key: bytes,
-    auth_key_id: bytes
+    auth_key_id: bytes,
+    zero_copy: bool = False,
+    lazy: bool = False
 ) -> Message:
     SecurityCheckMismatch.check(b.read(8) == auth_key_id, "b.read(8) == auth_key_id")
 
     msg_key = b.read(16)
     aes_key, aes_iv = kdf(auth_key, msg_key, False)
-    data = BytesIO(aes.ige256_decrypt(b.read(), aes_key, aes_iv))
+    plaintext = aes.ige256_decrypt(b.read(), aes_key, aes_iv)
+    data = BufferReader(plaintext) if zero_copy else BytesIO(plaintext)
     data.read(8)  # Salt
 
     # https://core.telegram.org/mtproto/security_guidelines#checking-session-id
     SecurityCheckMismatch.check(data.read(8) == session_id, "data.read(8) == session_id")
 
     try:
-        message = Message.read(data)
+        message = Message.read_lazy(data) if lazy else Message.read(data)
     except KeyError as e:
         if e.args[0] == 0:
             raise ConnectionError(f"Received empty data. Check your internet connection.")
@@ -82,17 +105,19 @@ def unpack(
 
     # https://core.telegram.org/mtproto/security_guidelines#checking-sha256-hash-value-of-msg-key
     # 96 = 88 + 8 (incoming message)
+    msg_key_large = sha256(auth_key[96:96 + 32])
+    msg_key_large.update(plaintext)
     SecurityCheckMismatch.check(
-        msg_key == sha256(auth_key[96:96 + 32] + data.getvalue()).digest()[8:24],
-        "msg_key == sha256(auth_key[96:96 + 32] + data.getvalue()).digest()[8:24]"
+        msg_key == msg_key_large.digest()[8:24],
+        "msg_key == sha256(auth_key[96:96 + 32] + plaintext).digest()[8:24]"
     )
 
     # https://core.telegram.org/mtproto/security_guidelines#checking-message-length
-    data.seek(32)  # Get to the payload, skip salt (8) + session_id (8) + msg_id (8) + seq_no (4) + length (4)
-    payload = data.read()
-    padding = payload[message.length:]
-    SecurityCheckMismatch.check(12 <= len(padding) <= 1024, "12 <= len(padding) <= 1024")
-    SecurityCheckMismatch.check(len(payload) % 4 == 0, "len(payload) % 4 == 0")
+    # Skip salt (8) + session_id (8) + msg_id (8) + seq_no (4) + length (4) to get the payload length
+    payload_length = len(plaintext) - 32
+    padding_length = payload_length - message.length
+    SecurityCheckMismatch.check(12 <= padding_length <= 1024, "12 <= padding_length <= 1024")
+    SecurityCheckMismatch.check(payload_length % 4 == 0, "payload_length % 4 == 0")
 
     # https://core.telegram.org/mtproto/security_guidelines#checking-msg-id
     SecurityCheckMismatch.check(message.msg_id % 2 != 0, "message.msg_id % 2 != 0")
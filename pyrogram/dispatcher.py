@@ -64,6 +64,13 @@ class Dispatcher:
         self.groups = OrderedDict()
 
         async def message_parser(update, users, chats):
+            if not isinstance(update, UpdateNewScheduledMessage):
+                if self.client.message_store:
+                    await self.client.message_store.put(update.message, users, chats)
+
+                if self.client.message_index:
+                    await self.client.message_index.put(update.message)
+
             return (
                 await pyrogram.types.Message._parse(self.client, update.message, users, chats,
                                                     isinstance(update, UpdateNewScheduledMessage)),
@@ -80,6 +87,15 @@ class Dispatcher:
             )
 
         async def deleted_messages_parser(update, users, chats):
+            channel_id = getattr(update, "channel_id", None)
+            chat_id = utils.get_channel_id(channel_id) if channel_id is not None else None
+
+            if self.client.message_store:
+                await self.client.message_store.delete(chat_id, update.messages)
+
+            if self.client.message_index:
+                await self.client.message_index.delete(chat_id, update.messages)
+
             return (
                 utils.parse_deleted_messages(self.client, update),
                 DeletedMessagesHandler
@@ -140,7 +156,12 @@ class Dispatcher:
             Dispatcher.CHAT_JOIN_REQUEST_UPDATES: chat_join_request_parser
         }
 
-        self.update_parsers = {key: value for key_tuple, value in self.update_parsers.items() for key in key_tuple}
+        # Keyed by constructor ID, so that picking a parser is a single lookup
+        self.update_parsers = {
+            key.ID: value
+            for key_tuple, value in self.update_parsers.items()
+            for key in key_tuple
+        }
 
     async def start(self):
         if not self.client.no_updates:
@@ -208,7 +229,7 @@ class Dispatcher:
 
             try:
                 update, users, chats = packet
-                parser = self.update_parsers.get(type(update), None)
+                parser = self.update_parsers.get(getattr(update, "ID", None), None)
 
                 parsed_update, handler_type = (
                     await parser(update, users, chats)
@@ -16,6 +16,7 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
+import asyncio
 import logging
 
 import pyrogram
@@ -25,13 +26,32 @@ from pyrogram.session import Session
 
 log = logging.getLogger(__name__)
 
+# Read-only functions which concurrent identical calls can share the response of, when requests are coalesced
+COALESCED_QUERIES = (
+    raw.functions.users.GetUsers,
+    raw.functions.users.GetFullUser,
+    raw.functions.messages.GetChats,
+    raw.functions.messages.GetFullChat,
+    raw.functions.messages.GetMessages,
+    raw.functions.messages.GetPeerDialogs,
+    raw.functions.messages.GetStickerSet,
+    raw.functions.messages.CheckChatInvite,
+    raw.functions.channels.GetChannels,
+    raw.functions.channels.GetFullChannel,
+    raw.functions.channels.GetParticipant,
+    raw.functions.channels.GetMessages,
+    raw.functions.contacts.ResolveUsername,
+    raw.functions.contacts.ResolvePhone,
+    raw.functions.help.GetConfig
+)
+
 
 class Invoke:
     async def invoke(
         self: "pyrogram.Client",
         query: TLObject,
         retries: int = Session.MAX_RETRIES,
-        timeout: float = Session.WAIT_TIMEOUT,
+        timeout: float = None,
         sleep_threshold: float = None
     ):
         """Invoke raw Telegram functions.
@@ -57,6 +77,7 @@ class Invoke:
 
             timeout (``float``):
                 Timeout in seconds.
+                Defaults to 15 seconds, extended on slow connections according to their measured round-trip time.
 
             sleep_threshold (``float``):
                 Sleep threshold in seconds.
@@ -70,13 +91,43 @@ class Invoke:
         if not self.is_connected:
             raise ConnectionError("Client has not been started yet")
 
-        if self.no_updates:
+        if self.coalesce_requests and isinstance(query, COALESCED_QUERIES):
+            # Callers only share a request sent with the same arguments as theirs
+            key = query.write(), retries, timeout, sleep_threshold
+            request = self.inflight_requests.get(key)
+
+            if request is None:
+                request = self.loop.create_task(self._invoke(query, retries, timeout, sleep_threshold))
+                request.add_done_callback(lambda _: self.inflight_requests.pop(key, None))
+
+                self.inflight_requests[key] = request
+
+            # Shielded, so that a cancelled caller doesn't cancel the request for the others sharing it
+            return await asyncio.shield(request)
+
+        return await self._invoke(query, retries, timeout, sleep_threshold)
+
+    async def _invoke(
+        self: "pyrogram.Client",
+        query: TLObject,
+        retries: int,
+        timeout: float,
+        sleep_threshold: float
+    ):
+        # Pick the session which is waiting on the fewest responses. Pooled sessions never receive updates.
+        session = self.session
+
+        for pooled_session in self.session_pool:
+            if pooled_session.is_started.is_set() and len(pooled_session.results) < len(session.results):
+                session = pooled_session
+
+        if self.no_updates or session is not self.session:
             query = raw.functions.InvokeWithoutUpdates(query=query)
 
         if self.takeout_id:
             query = raw.functions.InvokeWithTakeout(takeout_id=self.takeout_id, query=query)
 
-        r = await self.session.invoke(
+        r = await session.invoke(
             query, retries, timeout,
             (sleep_threshold
              if sleep_threshold is not None
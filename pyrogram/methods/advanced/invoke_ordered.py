@@ -0,0 +1,123 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import math
+from typing import Awaitable, Iterable, List
+
+import pyrogram
+from pyrogram import raw
+from pyrogram.errors import FloodWait
+from pyrogram.raw.core import TLObject
+from pyrogram.session.internals import FloodWaitRegistry
+
+
+class InvokeOrdered:
+    async def invoke_ordered(
+        self: "pyrogram.Client",
+        queries: Iterable[TLObject],
+        timeout: float = None,
+        sleep_threshold: float = None
+    ) -> List[asyncio.Task]:
+        """Invoke raw Telegram functions back-to-back, to be executed in the given order.
+
+        Every function after the first is wrapped in an invokeAfterMsg, which makes Telegram execute it only once the
+        previous one is done, and all of them are sent at once. Ordered requests (e.g.: sending many messages to the
+        same chat) then take about a single round trip instead of one per function.
+
+        Unlike :meth:`~pyrogram.Client.invoke`, failed functions are not retried, since sending one again would break
+        the chain.
+
+        .. include:: /_includes/usable-by/users-bots.rst
+
+        Parameters:
+            queries (Iterable of ``RawFunction``):
+                The API Schema functions filled with proper arguments, in the order they must be executed.
+
+            timeout (``float``, *optional*):
+                Timeout in seconds of each function.
+                Defaults to 15 seconds, extended on slow connections according to their measured round-trip time.
+
+            sleep_threshold (``float``, *optional*):
+                Sleep threshold in seconds, for flood waits known before the functions are sent.
+
+        Returns:
+            List of ``asyncio.Task``: One task per function, in the same order. Each task results in the raw type
+            response of its function, or raises its error. In case a function fails, the following ones can fail as
+            well.
+
+        Example:
+            .. code-block:: python
+
+                peer = await app.resolve_peer("me")
+
+                tasks = await app.invoke_ordered(
+                    raw.functions.messages.SendMessage(
+                        peer=peer,
+                        message=str(i),
+                        random_id=app.rnd_id()
+                    )
+                    for i in range(100)
+                )
+
+                await asyncio.gather(*tasks)
+        """
+        if not self.is_connected:
+            raise ConnectionError("Client has not been started yet")
+
+        if sleep_threshold is None:
+            sleep_threshold = self.sleep_threshold
+
+        queries = list(queries)
+        targets = [FloodWaitRegistry.get_target(query) for query in queries]
+
+        # The functions can't be retried individually without breaking the chain, so known flood waits are waited
+        # for before sending any of them
+        remaining = max((self.flood_waits.remaining(*target) for target in targets), default=0)
+
+        if remaining > 0:
+            if remaining > sleep_threshold >= 0:
+                raise FloodWait(math.ceil(remaining), targets[0][0])
+
+            await asyncio.sleep(remaining)
+
+        for i, query in enumerate(queries):
+            if self.no_updates:
+                query = raw.functions.InvokeWithoutUpdates(query=query)
+
+            if self.takeout_id:
+                query = raw.functions.InvokeWithTakeout(takeout_id=self.takeout_id, query=query)
+
+            queries[i] = query
+
+        async def invoke(result: Awaitable, target: tuple):
+            try:
+                r = await result
+            except FloodWait as e:
+                self.flood_waits.add(*target, e.value)
+                raise
+
+            await self.fetch_peers(getattr(r, "users", []))
+            await self.fetch_peers(getattr(r, "chats", []))
+
+            return r
+
+        # All functions go through the main session, since invokeAfterMsg only refers to messages of the same one
+        results = await self.session.send_ordered(queries, timeout)
+
+        return [self.loop.create_task(invoke(result, target)) for result, target in zip(results, targets)]
@@ -22,7 +22,6 @@ from typing import Union
 
 import pyrogram
 from pyrogram import raw
-from pyrogram import utils
 from pyrogram.errors import PeerIdInvalid
 
 log = logging.getLogger(__name__)
@@ -70,54 +69,14 @@ class ResolvePeer:
                 try:
                     int(peer_id)
                 except ValueError:
-                    try:
-                        return await self.storage.get_peer_by_username(peer_id)
-                    except KeyError:
-                        await self.invoke(
-                            raw.functions.contacts.ResolveUsername(
-                                username=peer_id
-                            )
-                        )
-
-                        return await self.storage.get_peer_by_username(peer_id)
+                    return await self.resolver.resolve_username(peer_id)
                 else:
                     try:
                         return await self.storage.get_peer_by_phone_number(peer_id)
                     except KeyError:
                         raise PeerIdInvalid
 
-            peer_type = utils.get_peer_type(peer_id)
-
-            if peer_type == "user":
-                await self.fetch_peers(
-                    await self.invoke(
-                        raw.functions.users.GetUsers(
-                            id=[
-                                raw.types.InputUser(
-                                    user_id=peer_id,
-                                    access_hash=0
-                                )
-                            ]
-                        )
-                    )
-                )
-            elif peer_type == "chat":
-                await self.invoke(
-                    raw.functions.messages.GetChats(
-                        id=[-peer_id]
-                    )
-                )
-            else:
-                await self.invoke(
-                    raw.functions.channels.GetChannels(
-                        id=[
-                            raw.types.InputChannel(
-                                channel_id=utils.get_channel_id(peer_id),
-                                access_hash=0
-                            )
-                        ]
-                    )
-                )
+            await self.resolver.fetch_peer(peer_id)
 
             try:
                 return await self.storage.get_peer_by_id(peer_id)
@@ -39,6 +39,12 @@ class Connect:
 
         await self.load_session()
 
+        if self.message_store:
+            await self.message_store.open()
+
+        if self.message_index:
+            await self.message_index.open()
+
         self.session = Session(
             self, await self.storage.dc_id(),
             await self.storage.auth_key(), await self.storage.test_mode()
@@ -37,4 +37,11 @@ class Disconnect:
 
         await self.session.stop()
         await self.storage.close()
+
+        if self.message_store:
+            await self.message_store.close()
+
+        if self.message_index:
+            await self.message_index.close()
+
         self.is_connected = False
@@ -20,6 +20,7 @@ import asyncio
 import logging
 
 import pyrogram
+from pyrogram.session import Session
 
 log = logging.getLogger(__name__)
 
@@ -45,6 +46,17 @@ class Initialize:
 
         self.load_plugins()
 
+        self.session_pool = [
+            Session(
+                self, await self.storage.dc_id(),
+                await self.storage.auth_key(), await self.storage.test_mode(),
+                no_updates=True
+            )
+            for _ in range(self.main_sessions - 1)
+        ]
+
+        await asyncio.gather(*[session.start() for session in self.session_pool])
+
         await self.dispatcher.start()
 
         self.updates_watchdog_task = asyncio.create_task(self.updates_watchdog())
@@ -51,6 +51,11 @@ class Terminate:
 
         self.media_sessions.clear()
 
+        for session in self.session_pool:
+            await session.stop()
+
+        self.session_pool.clear()
+
         self.updates_watchdog_event.set()
 
         if self.updates_watchdog_task is not None:
@@ -41,6 +41,7 @@ from .read_chat_history import ReadChatHistory
 from .retract_vote import RetractVote
 from .search_global import SearchGlobal
 from .search_global_count import SearchGlobalCount
+from .search_local_messages import SearchLocalMessages
 from .search_messages import SearchMessages
 from .search_messages_count import SearchMessagesCount
 from .send_animation import SendAnimation
@@ -109,6 +110,7 @@ class Messages(
     CopyMediaGroup,
     SearchMessagesCount,
     SearchGlobalCount,
+    SearchLocalMessages,
     GetDiscussionMessage,
     SendReaction,
     GetDiscussionReplies,
@@ -35,23 +35,27 @@ async def get_chunk(
 ):
     from_message_id = from_message_id or (1 if reverse else 0)
 
-    messages = await utils.parse_messages(
-            client,
-            await client.invoke(
-                raw.functions.messages.GetHistory(
-                    peer=await client.resolve_peer(chat_id),
-                    offset_id=from_message_id,
-                    offset_date=utils.datetime_to_timestamp(from_date),
-                    add_offset=offset * (-1 if reverse else 1) - (limit if reverse else 0),
-                    limit=limit,
-                    max_id=0,
-                    min_id=0,
-                    hash=0
-                ),
-                sleep_threshold=60
-            ),
-            replies=0
-        )
+    r = await client.invoke(
+        raw.functions.messages.GetHistory(
+            peer=await client.resolve_peer(chat_id),
+            offset_id=from_message_id,
+            offset_date=utils.datetime_to_timestamp(from_date),
+            add_offset=offset * (-1 if reverse else 1) - (limit if reverse else 0),
+            limit=limit,
+            max_id=0,
+            min_id=0,
+            hash=0
+        ),
+        sleep_threshold=60
+    )
+
+    if client.message_store:
+        await client.message_store.put_many(r)
+
+    if client.message_index:
+        await client.message_index.put_many(r)
+
+    messages = await utils.parse_messages(client, r, replies=0)
 
     if reverse:
         messages.reverse()
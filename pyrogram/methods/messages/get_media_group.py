@@ -21,6 +21,7 @@ from typing import Union, List
 
 import pyrogram
 from pyrogram import types
+from pyrogram import utils
 
 log = logging.getLogger(__name__)
 
@@ -56,6 +57,15 @@ class GetMediaGroup:
         if message_id <= 0:
             raise ValueError("Passed message_id is negative or equal to zero.")
 
+        if self.message_store and isinstance(chat_id, int):
+            stored = await self.message_store.get_media_group(chat_id, message_id)
+
+            if stored:
+                return types.List([
+                    m for r in stored
+                    for m in await utils.parse_messages(self, r, replies=0)
+                ])
+
         # Get messages with id from `id - 9` to `id + 10` to get all possible media group messages.
         messages = await self.get_messages(
             chat_id=chat_id,
@@ -114,6 +114,9 @@ class GetMessages:
 
         r = await self.invoke(rpc, sleep_threshold=-1)
 
+        if self.message_store and ids_type is raw.types.InputMessageID:
+            await self.message_store.put_many(r)
+
         messages = await utils.parse_messages(self, r, replies=replies)
 
         return messages if is_iterable else messages[0] if messages else None
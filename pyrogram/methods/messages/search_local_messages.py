@@ -0,0 +1,129 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from typing import Union, Optional, AsyncGenerator
+
+import pyrogram
+from pyrogram import types, raw, utils
+
+
+class SearchLocalMessages:
+    async def search_local_messages(
+        self: "pyrogram.Client",
+        query: str,
+        chat_id: Union[int, str] = None,
+        limit: int = 0,
+        offset: int = 0
+    ) -> Optional[AsyncGenerator["types.Message", None]]:
+        """Search the local message index, without contacting Telegram.
+
+        Only messages received while the client was running with ``index_messages=True`` (including those fetched with
+        :meth:`~pyrogram.Client.get_chat_history`) can be found. Matching messages are taken from the message cache or
+        the message store when available, otherwise they are fetched from Telegram.
+
+        .. include:: /_includes/usable-by/users-bots.rst
+
+        Parameters:
+            query (``str``):
+                An FTS5 full-text query, e.g.: "hello", "hello AND world", "hel*" or '"hello world"'.
+
+            chat_id (``int`` | ``str``, *optional*):
+                Unique identifier (int) or username (str) of the target chat.
+                By default, messages from all chats are searched.
+
+            limit (``int``, *optional*):
+                Limits the number of messages to be retrieved.
+                By default, no limit is applied and all messages are returned.
+
+            offset (``int``, *optional*):
+                Sequential number of the first message to be returned.
+                Defaults to 0.
+
+        Returns:
+            ``Generator``: A generator yielding :obj:`~pyrogram.types.Message` objects, newest first.
+
+        Raises:
+            ValueError: In case the client wasn't created with ``index_messages=True``.
+
+        Example:
+            .. code-block:: python
+
+                # Search for messages containing "spam" in all indexed chats
+                async for message in app.search_local_messages("spam"):
+                    print(message.text)
+        """
+        if not self.message_index:
+            raise ValueError("The local message index is disabled, create the client with index_messages=True")
+
+        if chat_id is not None and not isinstance(chat_id, int):
+            peer = await self.resolve_peer(chat_id)
+
+            if isinstance(peer, raw.types.InputPeerUser):
+                chat_id = peer.user_id
+            elif isinstance(peer, raw.types.InputPeerChat):
+                chat_id = -peer.chat_id
+            elif isinstance(peer, raw.types.InputPeerChannel):
+                chat_id = utils.get_channel_id(peer.channel_id)
+            else:
+                chat_id = self.me.id
+
+        current = 0
+        total = abs(limit) or (1 << 31) - 1
+
+        while True:
+            rows = await self.message_index.search(query, chat_id, min(100, total - current), offset)
+
+            if not rows:
+                return
+
+            offset += len(rows)
+
+            messages = {}
+            missing = {}
+
+            for row in rows:
+                message = self.message_cache[row] or await utils.get_stored_message(self, *row, replies=0)
+
+                if message:
+                    messages[row] = message
+                else:
+                    missing.setdefault(row[0], []).append(row[1])
+
+            for missing_chat_id, message_ids in missing.items():
+                for message in await self.get_messages(missing_chat_id, message_ids, replies=0):
+                    if message.empty:
+                        await self.message_index.delete(missing_chat_id, [message.id])
+
+                        # Deleted entries no longer count towards the offset of the next page
+                        offset -= 1
+                    else:
+                        messages[(missing_chat_id, message.id)] = message
+
+            for row in rows:
+                message = messages.get(row)
+
+                if message is None:
+                    continue
+
+                yield message
+
+                current += 1
+
+                if current >= total:
+                    return
@@ -103,4 +103,4 @@ class StreamMedia:
             offset += chunks
 
         async for chunk in self.get_file(file_id_obj, file_size, limit, offset):
-            yield chunk
+            yield bytes(chunk)
@@ -16,9 +16,11 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
+from .buffer_reader import BufferReader
 from .future_salt import FutureSalt
 from .future_salts import FutureSalts
 from .gzip_packed import GzipPacked
+from .lazy_object import LazyObject
 from .list import List
 from .message import Message
 from .msg_container import MsgContainer
@@ -29,3 +31,4 @@ from .primitives.int import Int, Long, Int128, Int256
 from .primitives.string import String
 from .primitives.vector import Vector
 from .tl_object import TLObject
+from .unknown_object import UnknownObject
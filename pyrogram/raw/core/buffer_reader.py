@@ -0,0 +1,39 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from io import BytesIO
+
+
+class BufferReader(BytesIO):
+    """A BytesIO that can hand out memoryview slices of its initial buffer instead of copies.
+
+    Large :obj:`Bytes` fields read from a BufferReader are returned as memoryview slices that keep the
+    underlying buffer alive; call ``bytes()`` on them only when an actual bytes object is needed.
+    """
+
+    def __init__(self, initial_bytes: bytes):
+        super().__init__(initial_bytes)
+
+        self.view = memoryview(initial_bytes)
+
+    def read_view(self, size: int) -> memoryview:
+        position = self.tell()
+        self.seek(size, 1)
+
+        return self.view[position:position + size]
@@ -32,6 +32,8 @@ class GzipPacked(TLObject):
 
     QUALNAME = "GzipPacked"
 
+    LAZY = True
+
     def __init__(self, packed_data: TLObject):
         self.packed_data = packed_data
 
@@ -46,17 +48,18 @@ class GzipPacked(TLObject):
             )
         ))
 
-    def write(self, *args: Any) -> bytes:
-        b = BytesIO()
+    @staticmethod
+    def read_lazy(data: BytesIO, *args: Any) -> "GzipPacked":
+        return cast(GzipPacked, TLObject.read_lazy(BytesIO(decompress(Bytes.read(data)))))
 
-        b.write(Int(self.ID, False))
+    @staticmethod
+    def skip(data: BytesIO, *args: Any) -> None:
+        Bytes.skip(data)
 
-        b.write(
-            Bytes(
-                compress(
-                    self.packed_data.write()
-                )
-            )
-        )
+    @staticmethod
+    def pack(data: bytes) -> bytes:
+        """Serialize a gzip_packed object wrapping already serialized data"""
+        return Int(GzipPacked.ID, False) + Bytes(compress(data))
 
-        return b.getvalue()
+    def write(self, *args: Any) -> bytes:
+        return GzipPacked.pack(self.packed_data.write())
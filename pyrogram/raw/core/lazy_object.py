@@ -0,0 +1,77 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from io import BytesIO
+from threading import Lock
+from typing import Any, Dict, Tuple
+
+from .tl_object import TLObject
+
+
+class LazyObject(TLObject):
+    """Base class of constructors whose nested objects and vectors of objects can be decoded on first access.
+
+    When an object is read with ``read_lazy``, such fields are left unset and only their offsets are recorded. The
+    buffer they were read from is kept alive until all of them have been accessed. Each field is decoded from a reader
+    of its own, as objects decoded from the same packet can be accessed from different threads at once.
+    """
+
+    __slots__ = ["_lazy"]
+
+    LAZY = True
+
+    # Guards the bookkeeping of deferred fields, so that concurrent accesses to the same one decode it only once
+    lock = Lock()
+
+    def defer(self, b: BytesIO, lazy: Dict[str, Tuple[int, tuple]]) -> "LazyObject":
+        if lazy:
+            for name in lazy:
+                delattr(self, name)
+
+            # Readers initialized with bytes share them, so new ones are created without copying the buffer
+            self._lazy = type(b), lazy, b.getvalue()
+
+        return self
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "_lazy":
+            raise AttributeError(name)
+
+        with LazyObject.lock:
+            try:
+                reader, lazy, data = self._lazy
+                offset, args = lazy[name]
+            except (AttributeError, KeyError):
+                # Unless another thread decoded it in the meantime
+                try:
+                    return object.__getattribute__(self, name)
+                except AttributeError:
+                    raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'") from None
+
+            b = reader(data)
+            b.seek(offset)
+            value = TLObject.read(b, *args)
+            setattr(self, name, value)
+
+            del lazy[name]
+
+            if not lazy:
+                del self._lazy
+
+        return value
@@ -17,10 +17,14 @@
 #  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
 from io import BytesIO
-from typing import Any
+from typing import Any, Callable
 
 from .primitives.int import Int, Long
 from .tl_object import TLObject
+from .unknown_object import UnknownObject
+from ..all import objects
+
+RPC_RESULT_ID = 0xF35C6D01  # rpc_result#f35c6d01 req_msg_id:long result:Object = RpcResult
 
 
 class Message(TLObject):
@@ -30,6 +34,8 @@ class Message(TLObject):
 
     QUALNAME = "Message"
 
+    LAZY = True
+
     def __init__(self, body: TLObject, msg_id: int, seq_no: int, length: int):
         self.msg_id = msg_id
         self.seq_no = seq_no
@@ -41,16 +47,66 @@ class Message(TLObject):
         msg_id = Long.read(data)
         seq_no = Int.read(data)
         length = Int.read(data)
-        body = data.read(length)
 
-        return Message(TLObject.read(BytesIO(body)), msg_id, seq_no, length)
+        return Message(Message.read_body(data, length, TLObject.read), msg_id, seq_no, length)
+
+    @staticmethod
+    def read_lazy(data: BytesIO, *args: Any) -> "Message":
+        msg_id = Long.read(data)
+        seq_no = Int.read(data)
+        length = Int.read(data)
+
+        return Message(Message.read_body(data, length, TLObject.read_lazy), msg_id, seq_no, length)
+
+    @staticmethod
+    def read_body(data: BytesIO, length: int, read: Callable[[BytesIO], TLObject]) -> TLObject:
+        # The body is decoded in place and the stream is moved past it according to its declared length.
+        # Its end is recorded on the stream for bare vectors, whose element size is guessed from the bytes left.
+        position = data.tell()
+        outer_end = getattr(data, "end", None)
+        data.end = position + length
+
+        try:
+            body = read(data)
+        except KeyError as e:
+            # Zero means there was no data at all, rather than an unknown constructor
+            if e.args[0] == 0:
+                raise
+
+            data.seek(position)
+            body = UnknownObject(data.read(length))
+
+            # Keep answers to requests routable even when their result can't be decoded
+            if body.ID == RPC_RESULT_ID:
+                body = objects[RPC_RESULT_ID](
+                    req_msg_id=int.from_bytes(body.data[4:12], "little", signed=True),
+                    result=UnknownObject(body.data[12:])
+                )
+        finally:
+            data.end = outer_end
+
+        data.seek(position + length)
+
+        return body
+
+    def _size(self) -> int:
+        # msg_id (8) + seq_no (4) + length (4)
+        return 16 + self.body._size()
 
     def write(self, *args: Any) -> bytes:
-        b = BytesIO()
+        b = bytearray()
+        self.write_into(b)
+
+        return bytes(b)
+
+    def write_into(self, b: bytearray, *args: Any) -> None:
+        b += Long(self.msg_id)
+        b += Int(self.seq_no)
 
-        b.write(Long(self.msg_id))
-        b.write(Int(self.seq_no))
-        b.write(Int(self.length))
-        b.write(self.body.write())
+        # The body is serialized in place, its length is filled in afterwards
+        position = len(b)
+        b += bytes(4)
+        self.body.write_into(b)
 
-        return b.getvalue()
+        self.length = len(b) - position - 4
+        b[position:position + 4] = Int(self.length)
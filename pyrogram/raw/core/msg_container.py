@@ -31,6 +31,8 @@ class MsgContainer(TLObject):
 
     QUALNAME = "MsgContainer"
 
+    LAZY = True
+
     def __init__(self, messages: List[Message]):
         self.messages = messages
 
@@ -39,15 +41,25 @@ class MsgContainer(TLObject):
         count = Int.read(data)
         return MsgContainer([Message.read(data) for _ in range(count)])
 
+    @staticmethod
+    def read_lazy(data: BytesIO, *args: Any) -> "MsgContainer":
+        count = Int.read(data)
+        return MsgContainer([Message.read_lazy(data) for _ in range(count)])
+
+    def _size(self) -> int:
+        return 8 + sum(i._size() for i in self.messages)
+
     def write(self, *args: Any) -> bytes:
-        b = BytesIO()
+        b = bytearray()
+        self.write_into(b)
+
+        return bytes(b)
 
-        b.write(Int(self.ID, False))
+    def write_into(self, b: bytearray, *args: Any) -> None:
+        b += Int(self.ID, False)
 
         count = len(self.messages)
-        b.write(Int(count))
+        b += Int(count)
 
         for message in self.messages:
-            b.write(message.write())
-
-        return b.getvalue()
+            message.write_into(b)
@@ -17,14 +17,18 @@
 #  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
 from io import BytesIO
-from typing import Any
+from typing import Any, Union
 
+from ..buffer_reader import BufferReader
 from ..tl_object import TLObject
 
 
 class Bytes(bytes, TLObject):
+    # Values at least this long are returned as memoryview slices when reading from a BufferReader
+    VIEW_MIN_SIZE = 16 * 1024
+
     @classmethod
-    def read(cls, data: BytesIO, *args: Any) -> bytes:
+    def read(cls, data: BytesIO, *args: Any) -> Union[bytes, memoryview]:
         length = int.from_bytes(data.read(1), "little")
 
         if length <= 253:
@@ -32,11 +36,36 @@ class Bytes(bytes, TLObject):
             data.read(-(length + 1) % 4)
         else:
             length = int.from_bytes(data.read(3), "little")
-            x = data.read(length)
+
+            if length >= Bytes.VIEW_MIN_SIZE and isinstance(data, BufferReader):
+                x = data.read_view(length)
+            else:
+                x = data.read(length)
+
             data.read(-length % 4)
 
         return x
 
+    @classmethod
+    def skip(cls, data: BytesIO, *args: Any) -> None:
+        length = int.from_bytes(data.read(1), "little")
+
+        if length <= 253:
+            data.seek(length + (-(length + 1) % 4), 1)
+        else:
+            length = int.from_bytes(data.read(3), "little")
+            data.seek(length + (-length % 4), 1)
+
+    @staticmethod
+    def size(value: bytes) -> int:
+        """Return the encoded length of a value without encoding it"""
+        length = len(value)
+
+        if length <= 253:
+            return length + 1 + (-(length + 1) % 4)
+
+        return length + 4 + (-length % 4)
+
     def __new__(cls, value: bytes) -> bytes:  # type: ignore
         length = len(value)
 
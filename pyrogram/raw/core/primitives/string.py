@@ -17,7 +17,6 @@
 #  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
 from io import BytesIO
-from typing import cast
 
 from .bytes import Bytes
 
@@ -25,7 +24,11 @@ from .bytes import Bytes
 class String(Bytes):
     @classmethod
     def read(cls, data: BytesIO, *args) -> str:  # type: ignore
-        return cast(bytes, super(String, String).read(data)).decode(errors="replace")
+        return str(super(String, String).read(data), "utf-8", "replace")
+
+    @staticmethod
+    def size(value: str) -> int:  # type: ignore
+        return Bytes.size(value.encode())
 
     def __new__(cls, value: str) -> bytes:  # type: ignore
         return super().__new__(cls, value.encode())
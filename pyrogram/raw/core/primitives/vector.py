@@ -42,15 +42,66 @@ class Vector(bytes, TLObject):
     @classmethod
     def read(cls, data: BytesIO, t: Any = None, *args: Any) -> List:
         count = Int.read(data)
-        left = len(data.read())
+
+        if t is not None:
+            return List(t.read(data) for _ in range(count))
+
+        # Without a known element type the vector is an RPC result, i.e.: the last item of the message body.
+        # Guess the element size from how many bytes are left up to the end of the body, or of the buffer.
+        position = data.tell()
+        end = getattr(data, "end", None)
+
+        if end is None:
+            end = data.seek(0, 2)
+            data.seek(position)
+
+        left = end - position
+
         size = (left / count) if count else 0
-        data.seek(-left, 1)
 
-        return List(
-            t.read(data) if t
-            else Vector.read_bare(data, size)
-            for _ in range(count)
-        )
+        return List(Vector.read_bare(data, size) for _ in range(count))
+
+    @classmethod
+    def skip(cls, data: BytesIO, t: Any = None, *args: Any) -> None:
+        count = Int.read(data)
+
+        if t is None:
+            # A bare vector ends its message body, or the buffer
+            end = getattr(data, "end", None)
+            data.seek(0, 2) if end is None else data.seek(end)
+        elif issubclass(t, Int):
+            data.seek(count * t.SIZE, 1)
+        else:
+            for _ in range(count):
+                t.skip(data)
+
+    @staticmethod
+    def size(value: list, t: Any = None) -> int:
+        """Return the encoded length of a vector without encoding it"""
+        if t is None:
+            return 8 + sum(i._size() for i in value)
+
+        if issubclass(t, Int):
+            return 8 + len(value) * t.SIZE
+
+        if hasattr(t, "size"):
+            return 8 + sum(t.size(i) for i in value)
+
+        # Double and Bool elements
+        return 8 + len(value) * len(t(value[0])) if value else 8
+
+    @classmethod
+    def extend(cls, b: bytearray, value: list, t: Any = None) -> None:
+        """Append the serialized vector to an existing buffer"""
+        b += Int(cls.ID, False)
+        b += Int(len(value))
+
+        if t:
+            for i in value:
+                b += t(i)
+        else:
+            for i in value:
+                i.write_into(b)
 
     def __new__(cls, value: list, t: Any = None) -> bytes:  # type: ignore
         return b"".join(
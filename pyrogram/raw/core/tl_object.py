@@ -28,17 +28,36 @@ class TLObject:
 
     QUALNAME = "Base"
 
+    # Whether the class implements read_lazy
+    LAZY = False
+
     @classmethod
     def read(cls, b: BytesIO, *args: Any) -> Any:
         return cast(TLObject, objects[int.from_bytes(b.read(4), "little")]).read(b, *args)
 
+    @classmethod
+    def read_lazy(cls, b: BytesIO, *args: Any) -> Any:
+        """Like read, but leave nested objects and vectors encoded in *b* until they are first accessed"""
+        obj = cast(TLObject, objects[int.from_bytes(b.read(4), "little")])
+
+        return obj.read_lazy(b, *args) if obj.LAZY else obj.read(b, *args)
+
+    @classmethod
+    def skip(cls, b: BytesIO, *args: Any) -> None:
+        """Move past a serialized object without decoding it"""
+        cast(TLObject, objects[int.from_bytes(b.read(4), "little")]).skip(b, *args)
+
     def write(self, *args: Any) -> bytes:
         pass
 
+    def write_into(self, b: bytearray, *args: Any) -> None:
+        b += self.write(*args)
+
     @staticmethod
     def default(obj: "TLObject") -> Union[str, Dict[str, str]]:
-        if isinstance(obj, bytes):
-            return repr(obj)
+        # Large bytes fields read from a BufferReader are memoryviews
+        if isinstance(obj, (bytes, memoryview)):
+            return repr(bytes(obj))
 
         return {
             "_": obj.QUALNAME,
@@ -56,12 +75,14 @@ class TLObject:
         if not hasattr(self, "QUALNAME"):
             return repr(self)
 
+        values = {attr: getattr(self, attr) for attr in self.__slots__}
+
         return "pyrogram.raw.{}({})".format(
             self.QUALNAME,
             ", ".join(
-                f"{attr}={repr(getattr(self, attr))}"
-                for attr in self.__slots__
-                if getattr(self, attr) is not None
+                f"{attr}={repr(bytes(value) if isinstance(value, memoryview) else value)}"
+                for attr, value in values.items()
+                if value is not None
             )
         )
 
@@ -75,8 +96,12 @@ class TLObject:
 
         return True
 
-    def __len__(self) -> int:
+    def _size(self) -> int:
+        """Return the encoded length of the object. Generated objects compute it without serializing themselves"""
         return len(self.write())
 
+    def __len__(self) -> int:
+        return self._size()
+
     def __call__(self, *args: Any, **kwargs: Any) -> Any:
         pass
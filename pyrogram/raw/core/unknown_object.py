@@ -0,0 +1,41 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from typing import Any
+
+from .tl_object import TLObject
+
+
+class UnknownObject(TLObject):
+    """An object whose constructor is not part of the generated API, kept in its serialized form.
+
+    This happens when the server sends constructors of a newer layer, or constructors left out of a reduced API
+    profile.
+    """
+
+    __slots__ = ["ID", "data"]
+
+    QUALNAME = "UnknownObject"
+
+    def __init__(self, data: bytes):
+        self.ID = int.from_bytes(data[:4], "little")
+        self.data = data
+
+    def write(self, *args: Any) -> bytes:
+        return bytes(self.data)
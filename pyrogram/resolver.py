@@ -0,0 +1,274 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, List, Tuple, Type
+
+import pyrogram
+from pyrogram import raw
+from pyrogram import utils
+from pyrogram.errors import BadRequest, RPCError, UsernameNotOccupied, UsernameInvalid
+
+log = logging.getLogger(__name__)
+
+
+class Resolver:
+    """Coalesce peer lookups that miss the local storage into batched requests.
+
+    Ids requested within :attr:`BATCH_DELAY` seconds of each other are fetched with a single ``users.GetUsers``,
+    ``messages.GetChats`` or ``channels.GetChannels`` call per peer kind, and identical ids share the same in-flight
+    request.
+
+    Usernames whose storage entry has expired are served from memory while being refreshed in the background,
+    usernames that don't exist are remembered for :attr:`MISSING_USERNAME_TTL` seconds and ``contacts.ResolveUsername``
+    calls are spaced at least :attr:`RESOLVE_USERNAME_INTERVAL` seconds apart.
+    """
+
+    BATCH_DELAY = 0.02
+    MAX_BATCH_SIZE = 200
+
+    MISSING_USERNAME_TTL = 5 * 60
+    RESOLVE_USERNAME_INTERVAL = 0.5
+    MAX_CACHED_USERNAMES = 10000
+
+    def __init__(self, client: "pyrogram.Client"):
+        self.client = client
+
+        self.pending: Dict[str, Dict[int, asyncio.Future]] = {"user": {}, "chat": {}, "channel": {}}
+        self.in_flight: Dict[int, asyncio.Future] = {}
+        self.flush_tasks: Dict[str, asyncio.Task] = {}
+
+        self.usernames: "OrderedDict[str, raw.base.InputPeer]" = OrderedDict()
+        self.missing_usernames: Dict[str, Tuple[float, Type[RPCError]]] = {}
+        self.username_lookups: Dict[str, asyncio.Future] = {}
+        self.resolve_username_lock = asyncio.Lock()
+        self.last_resolve_username = 0.0
+
+    async def fetch_peer(self, peer_id: int):
+        future = self.in_flight.get(peer_id)
+
+        if future is None:
+            peer_type = utils.get_peer_type(peer_id)
+            pending = self.pending[peer_type]
+            future = pending.get(peer_id)
+
+            if future is None:
+                future = self.client.loop.create_future()
+                pending[peer_id] = future
+
+                if len(pending) >= self.MAX_BATCH_SIZE:
+                    self.flush(peer_type)
+                elif peer_type not in self.flush_tasks:
+                    self.flush_tasks[peer_type] = self.client.loop.create_task(self.flush_later(peer_type))
+
+        # Shield the shared future so that a cancelled caller doesn't cancel the lookup for everybody else
+        await asyncio.shield(future)
+
+    async def flush_later(self, peer_type: str):
+        await asyncio.sleep(self.BATCH_DELAY)
+
+        self.flush_tasks.pop(peer_type, None)
+        self.flush(peer_type)
+
+    def flush(self, peer_type: str):
+        pending = self.pending[peer_type]
+
+        while pending:
+            batch = {}
+
+            while pending and len(batch) < self.MAX_BATCH_SIZE:
+                peer_id, future = pending.popitem()
+                batch[peer_id] = future
+
+            self.in_flight.update(batch)
+            self.client.loop.create_task(self.fetch_batch(peer_type, batch))
+
+        task = self.flush_tasks.pop(peer_type, None)
+
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+
+    async def fetch_batch(self, peer_type: str, batch: Dict[int, asyncio.Future]):
+        try:
+            await self.invoke(peer_type, list(batch))
+        except BadRequest as e:
+            if len(batch) == 1:
+                self.set_exception(batch, e)
+            else:
+                # A single invalid id can make the whole batch fail: retry each half of it to isolate the id.
+                # Other errors, such as flood waits, apply to the whole batch and are not retried.
+                log.debug("Batched %s lookup failed (%s), splitting %s ids", peer_type, e, len(batch))
+
+                items = list(batch.items())
+                middle = len(items) // 2
+
+                await asyncio.gather(
+                    self.fetch_batch(peer_type, dict(items[:middle])),
+                    self.fetch_batch(peer_type, dict(items[middle:]))
+                )
+
+                return
+        except Exception as e:
+            self.set_exception(batch, e)
+        else:
+            for future in batch.values():
+                if not future.done():
+                    future.set_result(None)
+        finally:
+            for peer_id in batch:
+                self.in_flight.pop(peer_id, None)
+
+    def set_exception(self, batch: Dict[int, asyncio.Future], e: BaseException):
+        for future in batch.values():
+            if not future.done():
+                future.set_exception(e)
+
+    async def invoke(self, peer_type: str, peer_ids: List[int]):
+        if peer_type == "user":
+            await self.client.fetch_peers(
+                await self.client.invoke(
+                    raw.functions.users.GetUsers(
+                        id=[
+                            raw.types.InputUser(
+                                user_id=peer_id,
+                                access_hash=0
+                            ) for peer_id in peer_ids
+                        ]
+                    )
+                )
+            )
+        elif peer_type == "chat":
+            await self.client.invoke(
+                raw.functions.messages.GetChats(
+                    id=[-peer_id for peer_id in peer_ids]
+                )
+            )
+        else:
+            await self.client.invoke(
+                raw.functions.channels.GetChannels(
+                    id=[
+                        raw.types.InputChannel(
+                            channel_id=utils.get_channel_id(peer_id),
+                            access_hash=0
+                        ) for peer_id in peer_ids
+                    ]
+                )
+            )
+
+    async def resolve_username(self, username: str) -> "raw.base.InputPeer":
+        try:
+            peer = await self.client.storage.get_peer_by_username(username)
+        except KeyError:
+            pass
+        else:
+            self.cache_username(username, peer)
+            return peer
+
+        missing = self.missing_usernames.get(username)
+
+        if missing is not None:
+            expires_at, error = missing
+
+            if time.monotonic() < expires_at:
+                raise error(rpc_name="contacts.ResolveUsername")
+
+            del self.missing_usernames[username]
+        else:
+            peer = self.usernames.get(username)
+
+            if peer is None:
+                # After a restart the expired entry is only left in storage
+                try:
+                    peer = await self.client.storage.get_expired_peer_by_username(username)
+                except KeyError:
+                    pass
+                else:
+                    self.cache_username(username, peer)
+
+            if peer is not None:
+                # Serve the expired entry right away and refresh it for the next callers
+                if username not in self.username_lookups:
+                    self.client.loop.create_task(self.refresh_username(username))
+
+                return peer
+
+        await self.fetch_username(username)
+
+        peer = await self.client.storage.get_peer_by_username(username)
+        self.cache_username(username, peer)
+
+        return peer
+
+    def cache_username(self, username: str, peer: "raw.base.InputPeer"):
+        self.usernames[username] = peer
+        self.usernames.move_to_end(username)
+
+        if len(self.usernames) > self.MAX_CACHED_USERNAMES:
+            self.usernames.popitem(last=False)
+
+    async def refresh_username(self, username: str):
+        try:
+            await self.fetch_username(username)
+        except Exception as e:
+            log.debug('Unable to refresh username "%s": %s', username, e)
+
+    async def fetch_username(self, username: str):
+        future = self.username_lookups.get(username)
+
+        if future is None:
+            future = self.client.loop.create_future()
+            self.username_lookups[username] = future
+            self.client.loop.create_task(self.invoke_resolve_username(username, future))
+
+        await asyncio.shield(future)
+
+    async def invoke_resolve_username(self, username: str, future: asyncio.Future):
+        try:
+            async with self.resolve_username_lock:
+                delay = self.last_resolve_username + self.RESOLVE_USERNAME_INTERVAL - time.monotonic()
+
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                try:
+                    await self.client.invoke(
+                        raw.functions.contacts.ResolveUsername(
+                            username=username
+                        )
+                    )
+                finally:
+                    self.last_resolve_username = time.monotonic()
+        except (UsernameNotOccupied, UsernameInvalid) as e:
+            self.usernames.pop(username, None)
+
+            if len(self.missing_usernames) >= self.MAX_CACHED_USERNAMES:
+                now = time.monotonic()
+                self.missing_usernames = {k: v for k, v in self.missing_usernames.items() if v[0] > now}
+
+            self.missing_usernames[username] = (time.monotonic() + self.MISSING_USERNAME_TTL, type(e))
+            future.set_exception(e)
+        except Exception as e:
+            future.set_exception(e)
+        else:
+            future.set_result(None)
+        finally:
+            self.username_lookups.pop(username, None)
@@ -17,5 +17,8 @@
 #  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
 from .data_center import DataCenter
+from .flood_wait_registry import FloodWaitRegistry, FloodWaitStats
 from .msg_factory import MsgFactory
 from .msg_id import MsgId
+from .rtt_estimator import RttEstimator
+from .timer_wheel import TimerWheel
@@ -0,0 +1,91 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import time
+from typing import Dict, Optional, Tuple
+
+from pyrogram.raw.core import TLObject
+
+
+class FloodWaitStats:
+    __slots__ = ["flood_waits", "total_wait", "max_wait", "parked_calls"]
+
+    def __init__(self):
+        # Flood waits received, their total and longest duration in seconds, and calls held back because of them
+        self.flood_waits = 0
+        self.total_wait = 0
+        self.max_wait = 0
+        self.parked_calls = 0
+
+    def __repr__(self) -> str:
+        return "FloodWaitStats(flood_waits={}, total_wait={}, max_wait={}, parked_calls={})".format(
+            self.flood_waits, self.total_wait, self.max_wait, self.parked_calls
+        )
+
+
+class FloodWaitRegistry:
+    """Flood waits required by Telegram, shared by all the sessions of a client.
+
+    Waits are kept by method and, for methods acting on a chat, by peer too. Calls which would be rejected anyway are
+    held back until the wait is over instead of being sent and collecting more flood waits.
+    """
+
+    def __init__(self):
+        self.deadlines = {}  # type: Dict[Tuple[str, Optional[bytes]], float]
+        self.stats = {}  # type: Dict[str, FloodWaitStats]
+
+    @staticmethod
+    def get_target(query: TLObject) -> Tuple[str, Optional[TLObject]]:
+        """Return the method name of a function and the peer it acts on, if any"""
+        peer = getattr(query, "peer", None) or getattr(query, "channel", None)
+
+        return (
+            ".".join(query.QUALNAME.split(".")[1:]),
+            peer if isinstance(peer, TLObject) else None
+        )
+
+    def add(self, method: str, peer: Optional[TLObject], seconds: int):
+        key = (method, peer.write() if peer else None)
+        self.deadlines[key] = max(self.deadlines.get(key, 0), time.monotonic() + seconds)
+
+        stats = self.stats.setdefault(method, FloodWaitStats())
+        stats.flood_waits += 1
+        stats.total_wait += seconds
+        stats.max_wait = max(stats.max_wait, seconds)
+
+    def remaining(self, method: str, peer: TLObject = None) -> float:
+        """Return the seconds left before a method can be called again, on the given peer if any"""
+        now = time.monotonic()
+        remaining = 0
+
+        # A wait observed without a peer applies to all of them
+        for key in {(method, None), (method, peer.write() if peer else None)}:
+            deadline = self.deadlines.get(key)
+
+            if deadline is None:
+                continue
+
+            if deadline <= now:
+                del self.deadlines[key]
+            else:
+                remaining = max(remaining, deadline - now)
+
+        return remaining
+
+    def park(self, method: str):
+        self.stats.setdefault(method, FloodWaitStats()).parked_calls += 1
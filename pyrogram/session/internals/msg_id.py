@@ -23,13 +23,32 @@ log = logging.getLogger(__name__)
 
 
 class MsgId:
-    last_time = 0
-    offset = 0
+    last_msg_id = 0
+
+    # Difference in seconds between the server clock and the local one
+    server_time_offset = 0
 
     def __new__(cls) -> int:
-        now = int(time.time())
-        cls.offset = (cls.offset + 4) if now == cls.last_time else 0
-        msg_id = (now * 2 ** 32) + cls.offset
-        cls.last_time = now
+        # Client message ids are divisible by 4 and always increase, unless the offset is corrected backwards
+        msg_id = int(cls.server_time() * 2 ** 32) & ~3
+        msg_id = max(msg_id, cls.last_msg_id + 4)
+        cls.last_msg_id = msg_id
 
         return msg_id
+
+    @classmethod
+    def server_time(cls) -> float:
+        return time.time() + cls.server_time_offset
+
+    @classmethod
+    def set_server_time(cls, server_time: float):
+        offset = server_time - time.time()
+
+        if abs(offset - cls.server_time_offset) >= 1:
+            log.info("Server time offset: %.3f seconds", offset)
+
+            # Ids generated ahead of the server clock were rejected, the next ones must not be kept above them
+            if offset < cls.server_time_offset:
+                cls.last_msg_id = 0
+
+        cls.server_time_offset = offset
@@ -0,0 +1,88 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import math
+from typing import Callable
+
+
+class Timer:
+    __slots__ = ["tick", "callback"]
+
+    def __init__(self, tick: int, callback: Callable[[], None]):
+        self.tick = tick
+        self.callback = callback
+
+
+class TimerWheel:
+    """Coarse-grained timers sharing a single event loop callback.
+
+    Timers are grouped in slots of RESOLUTION seconds and are checked once per slot, and only while there are any.
+    Meant for timeouts, which are way more often cancelled than expired and don't need to be precise.
+    """
+
+    RESOLUTION = 0.25
+
+    def __init__(self, resolution: float = RESOLUTION):
+        self.resolution = resolution
+        self.loop = asyncio.get_event_loop()
+
+        self.slots = {}
+        self.last_tick = None
+        self.handle = None
+
+    def __len__(self) -> int:
+        return sum(len(slot) for slot in self.slots.values())
+
+    def add(self, timeout: float, callback: Callable[[], None]) -> Timer:
+        now = self.loop.time()
+
+        if self.handle is None:
+            self.last_tick = int(now / self.resolution)
+            self.handle = self.loop.call_at((self.last_tick + 1) * self.resolution, self.advance)
+
+        # Timers never fall in a slot that was already checked
+        tick = max(math.ceil((now + timeout) / self.resolution), self.last_tick + 1)
+        timer = Timer(tick, callback)
+
+        self.slots.setdefault(tick, set()).add(timer)
+
+        return timer
+
+    def remove(self, timer: Timer):
+        slot = self.slots.get(timer.tick)
+
+        if slot is not None:
+            slot.discard(timer)
+
+            if not slot:
+                del self.slots[timer.tick]
+
+    def advance(self):
+        tick = int(self.loop.time() / self.resolution)
+
+        for t in range(self.last_tick + 1, tick + 1):
+            for timer in self.slots.pop(t, ()):
+                timer.callback()
+
+        self.last_tick = tick
+
+        if self.slots:
+            self.handle = self.loop.call_at((tick + 1) * self.resolution, self.advance)
+        else:
+            self.handle = None
@@ -19,9 +19,11 @@
 import asyncio
 import bisect
 import logging
+import math
 import os
 from hashlib import sha1
 from io import BytesIO
+from typing import Awaitable, List
 
 import pyrogram
 from pyrogram import raw
@@ -32,16 +34,44 @@ from pyrogram.errors import (
     SecurityCheckMismatch
 )
 from pyrogram.raw.all import layer
-from pyrogram.raw.core import TLObject, MsgContainer, Int, FutureSalts
-from .internals import MsgId, MsgFactory
+from pyrogram.raw.core import TLObject, Message, MsgContainer, Int, FutureSalt, FutureSalts
+from .internals import MsgId, MsgFactory, RttEstimator, TimerWheel, FloodWaitRegistry
 
 log = logging.getLogger(__name__)
 
+# Requests which only wrap another one, which is the one named in logs and errors
+WRAPPER_QUERIES = (
+    raw.functions.InvokeWithoutUpdates,
+    raw.functions.InvokeWithTakeout,
+    raw.functions.InvokeAfterMsg
+)
+
+# Requests whose response carries up to "limit" bytes of file data
+FILE_PART_REQUESTS = (raw.functions.upload.GetFile, raw.functions.upload.GetCdnFile)
+
+# Requests whose payload is file data, which is mostly compressed already and not worth gzip packing
+FILE_UPLOAD_REQUESTS = (raw.functions.upload.SaveFilePart, raw.functions.upload.SaveBigFilePart)
+
 
 class Result:
-    def __init__(self):
-        self.value = None
-        self.event = asyncio.Event()
+    def __init__(self, query: TLObject = None, msg_id: int = 0):
+        self.future = asyncio.get_event_loop().create_future()
+
+        # The request is kept to be sent again, under a new msg_id, in case the connection is lost.
+        # Requests chained to others by msg_id have none, as they can't be sent again.
+        self.query = query
+        self.msg_id = msg_id
+
+    def set(self, value):
+        if not self.future.done():
+            self.future.set_result(value)
+
+    def fail(self, exception: Exception):
+        if not self.future.done():
+            self.future.set_exception(exception)
+
+    def expire(self):
+        self.set(None)
 
 
 class Session:
@@ -51,7 +81,39 @@ class Session:
     MAX_RETRIES = 10
     ACKS_THRESHOLD = 10
     PING_INTERVAL = 5
+
+    # Bounds of the timeouts derived from the measured round-trip time, which replace WAIT_TIMEOUT once known, and
+    # the throughput assumed when extending a timeout by the size of the request and of the expected response.
+    # Requests wait at least WAIT_TIMEOUT, as some take the server longer than a round trip, but pings, which are
+    # answered right away, only MIN_PING_TIMEOUT, so that dead links are detected early.
+    MIN_WAIT_TIMEOUT = WAIT_TIMEOUT
+    MIN_PING_TIMEOUT = 5
+    MAX_WAIT_TIMEOUT = 60
+    MIN_THROUGHPUT = 128 * 1024
+
+    # Slow links are pinged less often, and so are media sessions, whose file parts keep the round-trip time measured
+    MAX_PING_INTERVAL = 30
+
+    RETRY_DELAY = 0.5
+    MAX_RETRY_DELAY = 5
     STORED_MSG_IDS_MAX_SIZE = 1000 * 2
+    MAX_CONTAINER_MESSAGES = 1020
+    GZIP_THRESHOLD = 1024
+
+    # Number of future salts requested at once (64 at most), how long before their expiration they are renewed and
+    # how long before its own expiration the current salt is replaced by the next one, in seconds.
+    FUTURE_SALTS_COUNT = 64
+    FUTURE_SALTS_RENEW_THRESHOLD = 60 * 60
+    SALT_EXPIRY_MARGIN = 60
+
+    # Bits of the state of a message sent, as reported in MsgsStateInfo: whether it was received and whether its
+    # answer was generated already
+    MSG_STATE_MASK = 7
+    MSG_RECEIVED = 4
+    MSG_ANSWERED = 64
+
+    # BadMsgNotification error codes for a msg_id too low or too high, after which the request is sent again once
+    BAD_MSG_TIME_ERRORS = (16, 17)
 
     TRANSPORT_ERRORS = {
         404: "auth key not found",
@@ -66,7 +128,9 @@ class Session:
         auth_key: bytes,
         test_mode: bool,
         is_media: bool = False,
-        is_cdn: bool = False
+        is_cdn: bool = False,
+        zero_copy: bool = False,
+        no_updates: bool = False
     ):
         self.client = client
         self.dc_id = dc_id
@@ -74,6 +138,8 @@ class Session:
         self.test_mode = test_mode
         self.is_media = is_media
         self.is_cdn = is_cdn
+        self.zero_copy = zero_copy
+        self.no_updates = no_updates
 
         self.connection = None
 
@@ -83,10 +149,17 @@ class Session:
         self.msg_factory = MsgFactory()
 
         self.salt = 0
+        self.future_salts = []
 
         self.pending_acks = set()
 
+        self.rtt = RttEstimator()
+
         self.results = {}
+        self.timers = TimerWheel()
+
+        # Requests whose answer is no longer awaited, for which the server is asked not to send it
+        self.dropped_msg_ids = []
 
         self.stored_msg_ids = []
 
@@ -100,6 +173,9 @@ class Session:
         self.loop = asyncio.get_event_loop()
 
     async def start(self):
+        # Requests still waiting for a response from a previous connection
+        pending = sorted(self.results.values(), key=lambda r: r.msg_id)
+
         while True:
             self.connection = Connection(
                 self.dc_id,
@@ -114,9 +190,21 @@ class Session:
 
                 self.recv_task = self.loop.create_task(self.recv_worker())
 
-                await self.send(raw.functions.Ping(ping_id=0), timeout=self.START_TIMEOUT)
+                if not self.future_salts:
+                    await self.load_salts()
+
+                self.rotate_salt()
+
+                start_timeout = max(self.START_TIMEOUT, self.rtt.timeout() or 0)
+
+                await self.send(raw.functions.Ping(ping_id=0), timeout=start_timeout)
 
                 if not self.is_cdn:
+                    query = raw.functions.help.GetConfig()
+
+                    if self.no_updates:
+                        query = raw.functions.InvokeWithoutUpdates(query=query)
+
                     await self.send(
                         raw.functions.InvokeWithLayer(
                             layer=layer,
@@ -128,10 +216,10 @@ class Session:
                                 system_lang_code=self.client.lang_code,
                                 lang_code=self.client.lang_code,
                                 lang_pack="",
-                                query=raw.functions.help.GetConfig(),
+                                query=query,
                             )
                         ),
-                        timeout=self.START_TIMEOUT
+                        timeout=start_timeout
                     )
 
                 self.ping_task = self.loop.create_task(self.ping_worker())
@@ -154,6 +242,12 @@ class Session:
 
         log.info("Session started")
 
+        # Salts are renewed by the ping worker, but the first ping is only due after a whole interval
+        self.loop.create_task(self.renew_salts())
+
+        if pending:
+            self.loop.create_task(self.resend(pending))
+
     async def stop(self):
         self.is_started.clear()
 
@@ -171,7 +265,7 @@ class Session:
         if self.recv_task:
             await self.recv_task
 
-        if not self.is_media and callable(self.client.disconnect_handler):
+        if not self.is_media and not self.no_updates and callable(self.client.disconnect_handler):
             try:
                 await self.client.disconnect_handler(self.client)
             except Exception as e:
@@ -190,7 +284,9 @@ class Session:
             BytesIO(packet),
             self.session_id,
             self.auth_key,
-            self.auth_key_id
+            self.auth_key_id,
+            self.zero_copy,
+            self.client.lazy_decoding
         )
 
         messages = (
@@ -208,6 +304,14 @@ class Session:
                 else:
                     self.pending_acks.add(msg.msg_id)
 
+            # The first message of a session and notifications about a msg_id that is too low or too high carry the
+            # server time, which is learned before checking the msg_id against the local clock.
+            if not self.stored_msg_ids or (
+                isinstance(msg.body, raw.types.BadMsgNotification)
+                and msg.body.error_code in self.BAD_MSG_TIME_ERRORS
+            ):
+                MsgId.set_server_time(msg.msg_id / 2 ** 32)
+
             try:
                 if len(self.stored_msg_ids) > Session.STORED_MSG_IDS_MAX_SIZE:
                     del self.stored_msg_ids[:Session.STORED_MSG_IDS_MAX_SIZE // 2]
@@ -219,7 +323,7 @@ class Session:
                     if msg.msg_id in self.stored_msg_ids:
                         raise SecurityCheckMismatch("The msg_id is equal to any of the stored values")
 
-                    time_diff = (msg.msg_id - MsgId()) / 2 ** 32
+                    time_diff = msg.msg_id / 2 ** 32 - MsgId.server_time()
 
                     if time_diff > 30:
                         raise SecurityCheckMismatch("The msg_id belongs to over 30 seconds in the future. "
@@ -235,28 +339,18 @@ class Session:
             else:
                 bisect.insort(self.stored_msg_ids, msg.msg_id)
 
-            if isinstance(msg.body, (raw.types.MsgDetailedInfo, raw.types.MsgNewDetailedInfo)):
-                self.pending_acks.add(msg.body.answer_msg_id)
-                continue
+            handler = Session.MESSAGE_HANDLERS.get(getattr(msg.body, "ID", None), None)
 
-            if isinstance(msg.body, raw.types.NewSessionCreated):
-                continue
+            if handler is None:
+                if self.client is not None and not self.no_updates:
+                    self.loop.create_task(self.client.handle_updates(msg.body))
 
-            msg_id = None
+                continue
 
-            if isinstance(msg.body, (raw.types.BadMsgNotification, raw.types.BadServerSalt)):
-                msg_id = msg.body.bad_msg_id
-            elif isinstance(msg.body, (FutureSalts, raw.types.RpcResult)):
-                msg_id = msg.body.req_msg_id
-            elif isinstance(msg.body, raw.types.Pong):
-                msg_id = msg.body.msg_id
-            else:
-                if self.client is not None:
-                    self.loop.create_task(self.client.handle_updates(msg.body))
+            msg_id = handler(self, msg.body)
 
             if msg_id in self.results:
-                self.results[msg_id].value = getattr(msg.body, "result", msg.body)
-                self.results[msg_id].event.set()
+                self.results[msg_id].set(getattr(msg.body, "result", msg.body))
 
         if len(self.pending_acks) >= self.ACKS_THRESHOLD:
             log.debug("Sending %s acks", len(self.pending_acks))
@@ -268,28 +362,142 @@ class Session:
             else:
                 self.pending_acks.clear()
 
+    def handle_detailed_info(self, body) -> None:
+        self.pending_acks.add(body.answer_msg_id)
+
+    def handle_new_session_created(self, body) -> None:
+        self.salt = body.server_salt
+
+    def handle_bad_msg(self, body) -> int:
+        return body.bad_msg_id
+
+    def handle_result(self, body) -> int:
+        return body.req_msg_id
+
+    def handle_pong(self, body) -> int:
+        return body.msg_id
+
+    # Service messages by constructor ID. Handlers return the id of the request a message answers, if any;
+    # everything else is an update.
+    MESSAGE_HANDLERS = {
+        raw.types.MsgDetailedInfo.ID: handle_detailed_info,
+        raw.types.MsgNewDetailedInfo.ID: handle_detailed_info,
+        raw.types.NewSessionCreated.ID: handle_new_session_created,
+        raw.types.BadMsgNotification.ID: handle_bad_msg,
+        raw.types.BadServerSalt.ID: handle_bad_msg,
+        FutureSalts.ID: handle_result,
+        raw.types.RpcResult.ID: handle_result,
+        raw.types.Pong.ID: handle_pong,
+        raw.types.MsgsStateInfo.ID: handle_result
+    }
+
     async def ping_worker(self):
         log.info("PingTask started")
 
         while True:
+            ping_interval = self.ping_interval()
+
             try:
-                await asyncio.wait_for(self.ping_task_event.wait(), self.PING_INTERVAL)
+                await asyncio.wait_for(self.ping_task_event.wait(), ping_interval)
             except asyncio.TimeoutError:
                 pass
             else:
                 break
 
+            self.rotate_salt()
+
+            await self.renew_salts()
+
+            timeout = self.ping_timeout()
+
             try:
                 await self.send(
                     raw.functions.PingDelayDisconnect(
-                        ping_id=0, disconnect_delay=self.WAIT_TIMEOUT + 10
-                    ), False
+                        ping_id=0, disconnect_delay=int(ping_interval + timeout) + 10
+                    ),
+                    timeout=timeout
                 )
+            except TimeoutError:
+                # The link is most likely dead, reconnect instead of waiting for the transport to notice
+                log.warning("Ping timed out after %.1f seconds, reconnecting", timeout)
+
+                if self.is_started.is_set():
+                    self.loop.create_task(self.restart())
+
+                break
             except (OSError, RPCError):
                 pass
 
         log.info("PingTask stopped")
 
+    def request_timeout(self, size: int = 0) -> float:
+        timeout = self.rtt.timeout()
+
+        if timeout is None:
+            timeout = self.WAIT_TIMEOUT
+
+        return min(max(timeout, self.MIN_WAIT_TIMEOUT), self.MAX_WAIT_TIMEOUT) + size / self.MIN_THROUGHPUT
+
+    def ping_timeout(self) -> float:
+        timeout = self.rtt.timeout()
+
+        if timeout is None:
+            timeout = self.WAIT_TIMEOUT
+
+        return min(max(timeout, self.MIN_PING_TIMEOUT), self.MAX_WAIT_TIMEOUT)
+
+    def ping_interval(self) -> float:
+        if self.is_media:
+            return self.MAX_PING_INTERVAL
+
+        return min(max(self.PING_INTERVAL, 10 * (self.rtt.srtt or 0)), self.MAX_PING_INTERVAL)
+
+    def retry_delay(self, attempt: int) -> float:
+        return min((self.rtt.srtt or self.RETRY_DELAY) * 2 ** attempt, self.MAX_RETRY_DELAY)
+
+    def rotate_salt(self):
+        now = MsgId.server_time()
+
+        while self.future_salts and self.future_salts[0].valid_until - self.SALT_EXPIRY_MARGIN <= now:
+            self.future_salts.pop(0)
+
+        if self.future_salts and self.future_salts[0].valid_since <= now:
+            self.salt = self.future_salts[0].salt
+
+    async def load_salts(self):
+        # Salts belong to an authorization, persisted ones are only valid for sessions using the stored auth key
+        if self.auth_key != await self.client.storage.auth_key():
+            return
+
+        self.future_salts = [
+            FutureSalt(valid_since, valid_until, salt)
+            for salt, valid_since, valid_until in await self.client.storage.get_salts(self.dc_id)
+        ]
+
+    async def renew_salts(self):
+        if (
+            self.future_salts
+            and self.future_salts[-1].valid_until - MsgId.server_time() >= self.FUTURE_SALTS_RENEW_THRESHOLD
+        ):
+            return
+
+        try:
+            await self.fetch_salts()
+        except (OSError, RPCError, TimeoutError):
+            pass
+
+    async def fetch_salts(self):
+        r = await self.send(raw.functions.GetFutureSalts(num=self.FUTURE_SALTS_COUNT))
+
+        self.future_salts = sorted(r.salts, key=lambda s: s.valid_since)
+        self.rotate_salt()
+
+        if self.auth_key == await self.client.storage.auth_key():
+            await self.client.storage.update_salts(
+                self.dc_id,
+                [(s.salt, s.valid_since, s.valid_until) for s in self.future_salts]
+            )
+
     async def recv_worker(self):
         log.info("NetworkTask started")
 
@@ -314,14 +522,11 @@ class Session:
 
         log.info("NetworkTask stopped")
 
-    async def send(self, data: TLObject, wait_response: bool = True, timeout: float = WAIT_TIMEOUT):
-        message = self.msg_factory(data)
-        msg_id = message.msg_id
+    async def send_message(self, message: Message):
+        query = message.body
 
-        if wait_response:
-            self.results[msg_id] = Result()
-
-        log.debug("Sent: %s", message)
+        while isinstance(query, WRAPPER_QUERIES):
+            query = query.query
 
         payload = await self.loop.run_in_executor(
             pyrogram.crypto_executor,
@@ -330,46 +535,216 @@ class Session:
             self.salt,
             self.session_id,
             self.auth_key,
-            self.auth_key_id
+            self.auth_key_id,
+            0 if isinstance(query, FILE_UPLOAD_REQUESTS) else self.GZIP_THRESHOLD
         )
 
+        log.debug("Sent: %s", message)
+
+        await self.connection.send(payload)
+
+    async def resend(self, pending: List[Result]):
+        # Skip requests which were answered or given up on in the meantime
+        pending = [result for result in pending if self.results.get(result.msg_id) is result]
+
+        if not pending:
+            return
+
+        # Requests the server received before the connection was lost are not sent again, as they could be executed
+        # twice. Those are left waiting for their answers, the others are sent again under new msg_ids.
         try:
-            await self.connection.send(payload)
-        except OSError as e:
-            self.results.pop(msg_id, None)
-            raise e
+            state = await self.send(raw.types.MsgsStateReq(msg_ids=[result.msg_id for result in pending]))
+        except (OSError, BadMsgNotification) as e:
+            log.warning("Unable to get the state of %s pending requests: %s", len(pending), e)
+            return
+
+        answered = []
+
+        for result, info in zip(pending, state.info):
+            if self.results.get(result.msg_id) is not result:
+                continue
+
+            if info & self.MSG_STATE_MASK == self.MSG_RECEIVED:
+                # Answers generated before the connection was lost are asked for again
+                if info & self.MSG_ANSWERED:
+                    answered.append(result.msg_id)
+
+                continue
+
+            if result.query is None:
+                del self.results[result.msg_id]
+                result.fail(ConnectionError("The connection was lost before the ordered request was sent"))
+                continue
+
+            message = self.msg_factory(result.query)
+
+            del self.results[result.msg_id]
+            result.msg_id = message.msg_id
+            self.results[result.msg_id] = result
+
+            log.debug("Resending %s", type(result.query).__name__)
 
-        if wait_response:
             try:
-                await asyncio.wait_for(self.results[msg_id].event.wait(), timeout)
-            except asyncio.TimeoutError:
+                await self.send_message(message)
+            except OSError:
+                return
+
+        if answered:
+            try:
+                await self.send(raw.types.MsgResendAnsReq(msg_ids=answered), False)
+            except OSError:
                 pass
 
-            result = self.results.pop(msg_id).value
+    def drop_answer(self, msg_id: int):
+        if not self.is_started.is_set():
+            return
+
+        # Answers dropped during the same loop iteration are batched in a single container
+        if not self.dropped_msg_ids:
+            self.loop.create_task(self.drop_answers())
+
+        self.dropped_msg_ids.append(msg_id)
+
+    async def drop_answers(self):
+        msg_ids, self.dropped_msg_ids = self.dropped_msg_ids, []
+
+        log.debug("Dropping %s answers", len(msg_ids))
+
+        # Late answers, or the RpcDropAnswer results, are then simply ignored as no one is waiting for them
+        messages = [self.msg_factory(raw.functions.RpcDropAnswer(req_msg_id=msg_id)) for msg_id in msg_ids]
+
+        try:
+            await self.send_message(
+                messages[0] if len(messages) == 1
+                else self.msg_factory(MsgContainer(messages))
+            )
+        except OSError:
+            pass
 
-            if result is None:
-                raise TimeoutError("Request timed out")
+    async def send(self, data: TLObject, wait_response: bool = True, timeout: float = None, resent: bool = False):
+        message = self.msg_factory(data)
+        msg_id = message.msg_id
 
-            if isinstance(result, raw.types.RpcError):
-                if isinstance(data, (raw.functions.InvokeWithoutUpdates, raw.functions.InvokeWithTakeout)):
-                    data = data.query
+        if wait_response:
+            waiter = self.results[msg_id] = Result(data, msg_id)
+
+        try:
+            await self.send_message(message)
+        except BaseException:
+            # Also when cancelled, so that the request isn't left waiting to be resent on reconnections
+            self.results.pop(msg_id, None)
+            raise
 
-                RPCError.raise_it(result, type(data))
+        if wait_response:
+            result = await self.wait_result(data, message, waiter, timeout)
 
             if isinstance(result, raw.types.BadMsgNotification):
                 log.warning("%s: %s", BadMsgNotification.__name__, BadMsgNotification(result.error_code))
 
+                # The server time is learned from the notification itself, so one more attempt is enough
+                if result.error_code not in self.BAD_MSG_TIME_ERRORS or resent:
+                    raise BadMsgNotification(result.error_code)
+
+                return await self.send(data, wait_response, timeout, resent=True)
+
             if isinstance(result, raw.types.BadServerSalt):
                 self.salt = result.new_server_salt
                 return await self.send(data, wait_response, timeout)
 
             return result
 
+    async def send_ordered(self, queries: List[TLObject], timeout: float = None) -> List[Awaitable]:
+        """Send requests to be executed one after the other and return an awaitable result for each of them"""
+        # Each request refers to the previous one by msg_id, so all of them are numbered at once, msg_id and seq_no,
+        # and sent in containers. They are never sent again under a new msg_id, which would break the chain.
+        messages = []
+
+        for query in queries:
+            if messages:
+                query = raw.functions.InvokeAfterMsg(msg_id=messages[-1].msg_id, query=query)
+
+            messages.append(self.msg_factory(query))
+
+        waiters = []
+
+        for message in messages:
+            waiter = self.results[message.msg_id] = Result(None, message.msg_id)
+            waiters.append(waiter)
+
+        try:
+            for i in range(0, len(messages), self.MAX_CONTAINER_MESSAGES):
+                chunk = messages[i:i + self.MAX_CONTAINER_MESSAGES]
+
+                await self.send_message(chunk[0] if len(chunk) == 1 else self.msg_factory(MsgContainer(chunk)))
+        except BaseException:
+            for message in messages:
+                self.results.pop(message.msg_id, None)
+
+            raise
+
+        return [
+            self.wait_ordered_result(message.body, message, waiter, timeout)
+            for message, waiter in zip(messages, waiters)
+        ]
+
+    async def wait_ordered_result(self, data: TLObject, message: Message, waiter: Result, timeout: float = None):
+        result = await self.wait_result(data, message, waiter, timeout)
+
+        if isinstance(result, raw.types.BadServerSalt):
+            self.salt = result.new_server_salt
+            raise BadMsgNotification(48)
+
+        if isinstance(result, raw.types.BadMsgNotification):
+            raise BadMsgNotification(result.error_code)
+
+        return result
+
+    async def wait_result(self, data: TLObject, message: Message, waiter: Result, timeout: float = None):
+        sent_at = self.loop.time()
+
+        if timeout is None:
+            # File parts take longer to transfer than the round-trip time, both ways
+            size = message.length
+
+            if isinstance(data, FILE_PART_REQUESTS):
+                size += data.limit
+
+            timeout = self.request_timeout(size)
+
+        timer = self.timers.add(timeout, waiter.expire)
+
+        try:
+            result = await waiter.future
+        except asyncio.CancelledError:
+            self.drop_answer(waiter.msg_id)
+            raise
+        finally:
+            self.timers.remove(timer)
+
+            # The request might have been sent again under a different msg_id
+            self.results.pop(waiter.msg_id, None)
+
+        # Only responses to requests that were not resent are unambiguous samples
+        if result is not None and waiter.msg_id == message.msg_id:
+            self.rtt.update(self.loop.time() - sent_at)
+
+        if result is None:
+            self.drop_answer(waiter.msg_id)
+            raise TimeoutError("Request timed out")
+
+        if isinstance(result, raw.types.RpcError):
+            while isinstance(data, WRAPPER_QUERIES):
+                data = data.query
+
+            RPCError.raise_it(result, type(data))
+
+        return result
+
     async def invoke(
         self,
         query: TLObject,
         retries: int = MAX_RETRIES,
-        timeout: float = WAIT_TIMEOUT,
+        timeout: float = None,
         sleep_threshold: float = SLEEP_THRESHOLD
     ):
         try:
@@ -377,18 +752,34 @@ class Session:
         except asyncio.TimeoutError:
             pass
 
-        if isinstance(query, (raw.functions.InvokeWithoutUpdates, raw.functions.InvokeWithTakeout)):
-            inner_query = query.query
-        else:
-            inner_query = query
+        inner_query = query
 
-        query_name = ".".join(inner_query.QUALNAME.split(".")[1:])
+        while isinstance(inner_query, WRAPPER_QUERIES):
+            inner_query = inner_query.query
+
+        query_name, peer = FloodWaitRegistry.get_target(inner_query)
+        flood_waits = self.client.flood_waits
 
         while True:
+            # Calls which Telegram is known to reject are held back until the flood wait is over, or fail right away
+            remaining = flood_waits.remaining(query_name, peer)
+
+            if remaining > 0:
+                flood_waits.park(query_name)
+
+                if remaining > sleep_threshold >= 0:
+                    raise FloodWait(math.ceil(remaining), query_name)
+
+                log.info('[%s] Holding back "%s" for %.1f seconds due to a flood wait',
+                         self.client.name, query_name, remaining)
+
+                await asyncio.sleep(remaining)
+
             try:
                 return await self.send(query, timeout=timeout)
             except FloodWait as e:
                 amount = e.value
+                flood_waits.add(query_name, peer, amount)
 
                 if amount > sleep_threshold >= 0:
                     raise
@@ -407,6 +798,6 @@ class Session:
                     query_name, str(e) or repr(e)
                 )
 
-                await asyncio.sleep(0.5)
+                await asyncio.sleep(self.retry_delay(Session.MAX_RETRIES - retries))
 
                 return await self.invoke(query, retries - 1, timeout)
@@ -18,4 +18,6 @@
 
 from .file_storage import FileStorage
 from .memory_storage import MemoryStorage
+from .message_index import MessageIndex
+from .message_store import MessageStore
 from .storage import Storage
@@ -49,6 +49,15 @@ class FileStorage(SQLiteStorage):
 
             version += 1
 
+        if version == 3:
+            with self.conn:
+                self.conn.execute(
+                    "CREATE TABLE salts (dc_id INTEGER NOT NULL, salt INTEGER NOT NULL, "
+                    "valid_since INTEGER NOT NULL, valid_until INTEGER NOT NULL, PRIMARY KEY (dc_id, salt))"
+                )
+
+            version += 1
+
         self.version(version)
 
     async def open(self):
@@ -0,0 +1,138 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import sqlite3
+from typing import Iterable, List, Optional, Tuple
+
+from pyrogram import raw
+from .. import utils
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries
+(
+    id         INTEGER PRIMARY KEY,
+    chat_id    INTEGER NOT NULL,
+    message_id INTEGER NOT NULL,
+    date       INTEGER NOT NULL,
+    UNIQUE (chat_id, message_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_entries_date ON entries (date);
+"""
+
+
+class MessageIndex:
+    """Local full-text index of message texts and captions, backed by SQLite FTS5.
+
+    Rows of the ``entries`` table map chat and message ids to the rowids of the ``entries_fts`` virtual table, which
+    holds the indexed text and is tokenized according to *tokenize* (any FTS5 tokenizer definition, e.g.: "trigram" or
+    "porter unicode61").
+    """
+
+    FILE_EXTENSION = ".index"
+    TOKENIZE = "unicode61 remove_diacritics 2"
+
+    def __init__(self, database: str, tokenize: str = TOKENIZE):
+        self.database = database
+        self.tokenize = tokenize
+
+        self.conn = None  # type: sqlite3.Connection
+
+    async def open(self):
+        self.conn = sqlite3.connect(self.database, timeout=1, check_same_thread=False)
+
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+
+            try:
+                tokenize = self.tokenize.replace("'", "''")
+
+                # Virtual table arguments can't be bound as parameters
+                self.conn.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(text, tokenize = '{tokenize}')"
+                )
+            except sqlite3.OperationalError as e:
+                raise RuntimeError(f"Unable to create the message index, SQLite must be built with FTS5: {e}")
+
+    async def close(self):
+        self.conn.close()
+
+    async def put(self, message: "raw.base.Message"):
+        if not isinstance(message, raw.types.Message):
+            return
+
+        chat_id = utils.get_peer_id(message.peer_id)
+
+        if not message.message:
+            await self.delete(chat_id, [message.id])
+            return
+
+        with self.conn:
+            r = self.conn.execute(
+                "SELECT id FROM entries WHERE chat_id = ? AND message_id = ?",
+                (chat_id, message.id)
+            ).fetchone()
+
+            if r is not None:
+                self.conn.execute("UPDATE entries_fts SET text = ? WHERE rowid = ?", (message.message, r[0]))
+            else:
+                rowid = self.conn.execute(
+                    "INSERT INTO entries (chat_id, message_id, date) VALUES (?, ?, ?)",
+                    (chat_id, message.id, message.date)
+                ).lastrowid
+
+                self.conn.execute("INSERT INTO entries_fts (rowid, text) VALUES (?, ?)", (rowid, message.message))
+
+    async def put_many(self, messages: "raw.base.messages.Messages"):
+        for message in messages.messages:
+            await self.put(message)
+
+    async def delete(self, chat_id: Optional[int], message_ids: Iterable[int]):
+        if chat_id is not None:
+            rows: List[Tuple] = [(chat_id, i) for i in message_ids]
+            query = "SELECT id FROM entries WHERE chat_id = ? AND message_id = ?"
+        else:
+            # Ids of messages outside channels are unique across the private chats and basic groups of an account
+            rows = [(i, utils.MAX_CHANNEL_ID) for i in message_ids]
+            query = "SELECT id FROM entries WHERE message_id = ? AND chat_id > ?"
+
+        with self.conn:
+            ids = [(r[0],) for row in rows for r in self.conn.execute(query, row).fetchall()]
+
+            self.conn.executemany("DELETE FROM entries_fts WHERE rowid = ?", ids)
+            self.conn.executemany("DELETE FROM entries WHERE id = ?", ids)
+
+    async def search(
+        self,
+        query: str,
+        chat_id: int = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> List[Tuple[int, int]]:
+        """Return (chat_id, message_id) pairs of the messages matching an FTS5 query, newest first"""
+        return self.conn.execute(
+            "SELECT e.chat_id, e.message_id FROM entries_fts f JOIN entries e ON e.id = f.rowid "
+            "WHERE entries_fts MATCH ?{} ORDER BY e.date DESC, e.id DESC LIMIT ? OFFSET ?".format(
+                " AND e.chat_id = ?" if chat_id is not None else ""
+            ),
+            (query, chat_id, limit, offset) if chat_id is not None else (query, limit, offset)
+        ).fetchall()
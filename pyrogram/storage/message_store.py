@@ -0,0 +1,215 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import logging
+import sqlite3
+from io import BytesIO
+from typing import List, Optional, Iterable, Set, Tuple
+
+from pyrogram import raw
+from pyrogram.raw.core import TLObject
+from .. import utils
+
+log = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages
+(
+    chat_id        INTEGER NOT NULL,
+    message_id     INTEGER NOT NULL,
+    media_group_id INTEGER,
+    data           BLOB    NOT NULL,
+    PRIMARY KEY (chat_id, message_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_messages_media_group_id ON messages (chat_id, media_group_id);
+"""
+
+
+def get_peer_ids(obj, users: Set[int], chats: Set[int]):
+    """Collect the ids of users and chats a raw message refers to"""
+    if isinstance(obj, list):
+        for i in obj:
+            get_peer_ids(i, users, chats)
+
+        return
+
+    if isinstance(obj, raw.types.PeerUser):
+        users.add(obj.user_id)
+    elif isinstance(obj, raw.types.PeerChat):
+        chats.add(obj.chat_id)
+    elif isinstance(obj, raw.types.PeerChannel):
+        chats.add(obj.channel_id)
+    elif isinstance(obj, TLObject):
+        for attr in obj.__slots__:
+            value = getattr(obj, attr)
+
+            if attr in ("user_id", "via_bot_id", "inviter_id") and isinstance(value, int):
+                users.add(value)
+            elif attr == "users" and isinstance(value, list):
+                users.update(i for i in value if isinstance(i, int))
+            elif isinstance(value, (TLObject, list)):
+                get_peer_ids(value, users, chats)
+
+
+class MessageStore:
+    """Persistent store of raw messages, keyed by chat id and message id.
+
+    Each message is saved as a serialized ``messages.Messages`` holding the message itself together with the users
+    and chats it refers to, so that it can be parsed again without contacting Telegram.
+    Once the stored data exceeds :attr:`MAX_SIZE` bytes, the least recently written messages are removed.
+    """
+
+    FILE_EXTENSION = ".messages"
+    MAX_SIZE = 64 * 1024 * 1024
+
+    def __init__(self, database: str, max_size: int = MAX_SIZE):
+        self.database = database
+        self.max_size = max_size
+
+        self.conn = None  # type: sqlite3.Connection
+        self.size = 0
+
+    async def open(self):
+        self.conn = sqlite3.connect(self.database, timeout=1, check_same_thread=False)
+
+        # Every write is committed on its own, WAL keeps those commits cheap
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+
+        self.size = self.get_size()
+
+    async def close(self):
+        self.conn.close()
+
+    def get_size(self) -> int:
+        return self.conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(data)), 0) FROM messages"
+        ).fetchone()[0]
+
+    async def put(self, message: "raw.base.Message", users: dict, chats: dict):
+        if isinstance(message, raw.types.MessageEmpty):
+            return
+
+        user_ids, chat_ids = set(), set()
+        get_peer_ids(message, user_ids, chat_ids)
+
+        data = raw.types.messages.Messages(
+            messages=[message],
+            users=[users[i] for i in user_ids if i in users],
+            chats=[chats[i] for i in chat_ids if i in chats]
+        ).write()
+
+        chat_id = utils.get_peer_id(message.peer_id)
+
+        with self.conn:
+            # An edited message replaces the stored one, whose size no longer counts
+            replaced = self.conn.execute(
+                "SELECT LENGTH(data) FROM messages WHERE chat_id = ? AND message_id = ?",
+                (chat_id, message.id)
+            ).fetchone()
+
+            self.conn.execute(
+                "REPLACE INTO messages (chat_id, message_id, media_group_id, data) VALUES (?, ?, ?, ?)",
+                (chat_id, message.id, getattr(message, "grouped_id", None), data)
+            )
+
+        self.size += len(data) - (replaced[0] if replaced else 0)
+
+        if self.size > self.max_size:
+            self.trim()
+
+    async def put_many(self, messages: "raw.base.messages.Messages"):
+        users = {i.id: i for i in messages.users}
+        chats = {i.id: i for i in messages.chats}
+
+        for message in messages.messages:
+            await self.put(message, users, chats)
+
+    def trim(self):
+        self.size = self.get_size()
+
+        with self.conn:
+            while self.size > self.max_size * 0.9:
+                rows = self.conn.execute(
+                    "SELECT rowid, LENGTH(data) FROM messages ORDER BY rowid LIMIT 1000"
+                ).fetchall()
+
+                if not rows:
+                    break
+
+                self.conn.executemany("DELETE FROM messages WHERE rowid = ?", [(i[0],) for i in rows])
+                self.size -= sum(i[1] for i in rows)
+
+        log.debug("Message store trimmed to %s bytes", self.size)
+
+    async def get(self, chat_id: int, message_id: int) -> Optional["raw.types.messages.Messages"]:
+        r = self.conn.execute(
+            "SELECT data FROM messages WHERE chat_id = ? AND message_id = ?",
+            (chat_id, message_id)
+        ).fetchone()
+
+        return TLObject.read(BytesIO(r[0])) if r else None
+
+    async def get_media_group(self, chat_id: int, message_id: int) -> List["raw.types.messages.Messages"]:
+        """Return the stored messages of a media group, or an empty list unless the whole group is known to be stored.
+
+        A group is considered complete when its messages have consecutive ids and the messages right before and after
+        it are stored as well, without belonging to it.
+        """
+        r = self.conn.execute(
+            "SELECT message_id, media_group_id, data FROM messages WHERE chat_id = ? AND media_group_id = ("
+            "SELECT media_group_id FROM messages WHERE chat_id = ? AND message_id = ?"
+            ") ORDER BY message_id",
+            (chat_id, chat_id, message_id)
+        ).fetchall()
+
+        if not r:
+            return []
+
+        first_id, last_id, media_group_id = r[0][0], r[-1][0], r[0][1]
+
+        if last_id - first_id + 1 != len(r):
+            return []
+
+        boundaries = self.conn.execute(
+            "SELECT COUNT(*) FROM messages WHERE chat_id = ? AND message_id IN (?, ?) "
+            "AND (media_group_id IS NULL OR media_group_id != ?)",
+            (chat_id, first_id - 1, last_id + 1, media_group_id)
+        ).fetchone()[0]
+
+        if boundaries != 2:
+            return []
+
+        return [TLObject.read(BytesIO(i[2])) for i in r]
+
+    async def delete(self, chat_id: Optional[int], message_ids: Iterable[int]):
+        if chat_id is not None:
+            rows: List[Tuple] = [(chat_id, i) for i in message_ids]
+            query = "DELETE FROM messages WHERE chat_id = ? AND message_id = ?"
+        else:
+            # Ids of messages outside channels are unique across the private chats and basic groups of an account
+            rows = [(i, utils.MAX_CHANNEL_ID) for i in message_ids]
+            query = "DELETE FROM messages WHERE message_id = ? AND chat_id > ?"
+
+        with self.conn:
+            self.conn.executemany(query, rows)
@@ -53,6 +53,15 @@ CREATE TABLE version
     number INTEGER PRIMARY KEY
 );
 
+CREATE TABLE salts
+(
+    dc_id       INTEGER NOT NULL,
+    salt        INTEGER NOT NULL,
+    valid_since INTEGER NOT NULL,
+    valid_until INTEGER NOT NULL,
+    PRIMARY KEY (dc_id, salt)
+);
+
 CREATE INDEX idx_peers_id ON peers (id);
 CREATE INDEX idx_peers_username ON peers (username);
 CREATE INDEX idx_peers_phone_number ON peers (phone_number);
@@ -90,7 +99,7 @@ def get_input_peer(peer_id: int, access_hash: int, peer_type: str):
 
 
 class SQLiteStorage(Storage):
-    VERSION = 3
+    VERSION = 4
     USERNAME_TTL = 8 * 60 * 60
 
     def __init__(self, name: str):
@@ -158,6 +167,18 @@ class SQLiteStorage(Storage):
 
         return get_input_peer(*r[:3])
 
+    async def get_expired_peer_by_username(self, username: str):
+        r = self.conn.execute(
+            "SELECT id, access_hash, type FROM peers WHERE username = ? "
+            "ORDER BY last_update_on DESC",
+            (username,)
+        ).fetchone()
+
+        if r is None:
+            raise KeyError(f"Username not found: {username}")
+
+        return get_input_peer(*r)
+
     async def get_peer_by_phone_number(self, phone_number: str):
         r = self.conn.execute(
             "SELECT id, access_hash, type FROM peers WHERE phone_number = ?",
@@ -169,6 +190,26 @@ class SQLiteStorage(Storage):
 
         return get_input_peer(*r)
 
+    async def update_salts(self, dc_id: int, salts: List[Tuple[int, int, int]]):
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM salts WHERE dc_id = ?",
+                (dc_id,)
+            )
+
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO salts (dc_id, salt, valid_since, valid_until) "
+                "VALUES (?, ?, ?, ?)",
+                [(dc_id, *salt) for salt in salts]
+            )
+
+    async def get_salts(self, dc_id: int) -> List[Tuple[int, int, int]]:
+        return self.conn.execute(
+            "SELECT salt, valid_since, valid_until FROM salts WHERE dc_id = ? AND valid_until > ? "
+            "ORDER BY valid_since",
+            (dc_id, int(time.time()))
+        ).fetchall()
+
     def _get(self):
         attr = inspect.stack()[2].function
 
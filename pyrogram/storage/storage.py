@@ -53,9 +53,20 @@ class Storage:
     async def get_peer_by_username(self, username: str):
         raise NotImplementedError
 
+    async def get_expired_peer_by_username(self, username: str):
+        # Optional: storages that keep expired usernames can return them to be served while they are refreshed
+        raise KeyError(f"Username not found: {username}")
+
     async def get_peer_by_phone_number(self, phone_number: str):
         raise NotImplementedError
 
+    # Persisting server salts is optional: storages which don't keep them make sessions fetch new ones instead
+    async def update_salts(self, dc_id: int, salts: List[Tuple[int, int, int]]):
+        pass
+
+    async def get_salts(self, dc_id: int) -> List[Tuple[int, int, int]]:
+        return []
+
     async def dc_id(self, value: int = object):
         raise NotImplementedError
 
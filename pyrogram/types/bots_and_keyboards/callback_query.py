@@ -97,6 +97,9 @@ class CallbackQuery(Object, Update):
 
             message = client.message_cache[(chat_id, message_id)]
 
+            if not message:
+                message = await utils.get_stored_message(client, chat_id, message_id)
+
             if not message:
                 message = await client.get_messages(chat_id, message_id)
         elif isinstance(callback_query, raw.types.UpdateInlineBotCallbackQuery):
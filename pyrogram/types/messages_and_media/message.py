@@ -56,6 +56,200 @@ class Str(str):
         return parser_utils.remove_surrogates(parser_utils.add_surrogates(self)[item])
 
 
+# Service message actions and media are parsed through tables keyed by constructor ID. Each parser returns the
+# service (or media) type together with the Message fields it fills in.
+
+def parse_chat_add_user(client, message, action, users):
+    new_chat_members = [types.User._parse(client, users[i]) for i in action.users]
+    return enums.MessageServiceType.NEW_CHAT_MEMBERS, {"new_chat_members": new_chat_members}
+
+
+def parse_chat_joined_by_link(client, message, action, users):
+    new_chat_members = [types.User._parse(client, users[utils.get_raw_peer_id(message.from_id)])]
+    return enums.MessageServiceType.NEW_CHAT_MEMBERS, {"new_chat_members": new_chat_members}
+
+
+def parse_chat_delete_user(client, message, action, users):
+    left_chat_member = types.User._parse(client, users[action.user_id])
+    return enums.MessageServiceType.LEFT_CHAT_MEMBERS, {"left_chat_member": left_chat_member}
+
+
+def parse_chat_edit_title(client, message, action, users):
+    return enums.MessageServiceType.NEW_CHAT_TITLE, {"new_chat_title": action.title}
+
+
+def parse_chat_delete_photo(client, message, action, users):
+    return enums.MessageServiceType.DELETE_CHAT_PHOTO, {"delete_chat_photo": True}
+
+
+def parse_chat_migrate_to(client, message, action, users):
+    migrate_to_chat_id = utils.get_channel_id(action.channel_id) if action.channel_id else None
+    return enums.MessageServiceType.MIGRATE_TO_CHAT_ID, {"migrate_to_chat_id": migrate_to_chat_id}
+
+
+def parse_channel_migrate_from(client, message, action, users):
+    migrate_from_chat_id = -action.chat_id if action.chat_id else None
+    return enums.MessageServiceType.MIGRATE_FROM_CHAT_ID, {"migrate_from_chat_id": migrate_from_chat_id}
+
+
+def parse_chat_create(client, message, action, users):
+    return enums.MessageServiceType.GROUP_CHAT_CREATED, {"group_chat_created": True}
+
+
+def parse_channel_create(client, message, action, users):
+    return enums.MessageServiceType.CHANNEL_CHAT_CREATED, {"channel_chat_created": True}
+
+
+def parse_chat_edit_photo(client, message, action, users):
+    return enums.MessageServiceType.NEW_CHAT_PHOTO, {"new_chat_photo": types.Photo._parse(client, action.photo)}
+
+
+def parse_group_call_scheduled(client, message, action, users):
+    video_chat_scheduled = types.VideoChatScheduled._parse(action)
+    return enums.MessageServiceType.VIDEO_CHAT_SCHEDULED, {"video_chat_scheduled": video_chat_scheduled}
+
+
+def parse_group_call(client, message, action, users):
+    if action.duration:
+        return enums.MessageServiceType.VIDEO_CHAT_ENDED, {"video_chat_ended": types.VideoChatEnded._parse(action)}
+
+    return enums.MessageServiceType.VIDEO_CHAT_STARTED, {"video_chat_started": types.VideoChatStarted()}
+
+
+def parse_invite_to_group_call(client, message, action, users):
+    return enums.MessageServiceType.VIDEO_CHAT_MEMBERS_INVITED, {
+        "video_chat_members_invited": types.VideoChatMembersInvited._parse(client, action, users)
+    }
+
+
+def parse_web_view_data_sent_me(client, message, action, users):
+    return enums.MessageServiceType.WEB_APP_DATA, {"web_app_data": types.WebAppData._parse(action)}
+
+
+MESSAGE_ACTION_PARSERS = {
+    raw.types.MessageActionChatAddUser.ID: parse_chat_add_user,
+    raw.types.MessageActionChatJoinedByLink.ID: parse_chat_joined_by_link,
+    raw.types.MessageActionChatDeleteUser.ID: parse_chat_delete_user,
+    raw.types.MessageActionChatEditTitle.ID: parse_chat_edit_title,
+    raw.types.MessageActionChatDeletePhoto.ID: parse_chat_delete_photo,
+    raw.types.MessageActionChatMigrateTo.ID: parse_chat_migrate_to,
+    raw.types.MessageActionChannelMigrateFrom.ID: parse_channel_migrate_from,
+    raw.types.MessageActionChatCreate.ID: parse_chat_create,
+    raw.types.MessageActionChannelCreate.ID: parse_channel_create,
+    raw.types.MessageActionChatEditPhoto.ID: parse_chat_edit_photo,
+    raw.types.MessageActionGroupCallScheduled.ID: parse_group_call_scheduled,
+    raw.types.MessageActionGroupCall.ID: parse_group_call,
+    raw.types.MessageActionInviteToGroupCall.ID: parse_invite_to_group_call,
+    raw.types.MessageActionWebViewDataSentMe.ID: parse_web_view_data_sent_me
+}
+
+
+async def parse_media_photo(client, message, media):
+    return enums.MessageMediaType.PHOTO, {
+        "photo": types.Photo._parse(client, media.photo, media.ttl_seconds),
+        "has_media_spoiler": media.spoiler
+    }
+
+
+async def parse_media_geo(client, message, media):
+    return enums.MessageMediaType.LOCATION, {"location": types.Location._parse(client, media.geo)}
+
+
+async def parse_media_contact(client, message, media):
+    return enums.MessageMediaType.CONTACT, {"contact": types.Contact._parse(client, media)}
+
+
+async def parse_media_venue(client, message, media):
+    return enums.MessageMediaType.VENUE, {"venue": types.Venue._parse(client, media)}
+
+
+async def parse_media_game(client, message, media):
+    return enums.MessageMediaType.GAME, {"game": types.Game._parse(client, message)}
+
+
+async def parse_media_document(client, message, media):
+    doc = media.document
+
+    if not isinstance(doc, raw.types.Document):
+        return None, {}
+
+    attributes = {type(i): i for i in doc.attributes}
+
+    file_name = getattr(
+        attributes.get(
+            raw.types.DocumentAttributeFilename, None
+        ), "file_name", None
+    )
+
+    if raw.types.DocumentAttributeAnimated in attributes:
+        video_attributes = attributes.get(raw.types.DocumentAttributeVideo, None)
+
+        return enums.MessageMediaType.ANIMATION, {
+            "animation": types.Animation._parse(client, doc, video_attributes, file_name),
+            "has_media_spoiler": media.spoiler
+        }
+    elif raw.types.DocumentAttributeSticker in attributes:
+        return enums.MessageMediaType.STICKER, {"sticker": await types.Sticker._parse(client, doc, attributes)}
+    elif raw.types.DocumentAttributeVideo in attributes:
+        video_attributes = attributes[raw.types.DocumentAttributeVideo]
+
+        if video_attributes.round_message:
+            return enums.MessageMediaType.VIDEO_NOTE, {
+                "video_note": types.VideoNote._parse(client, doc, video_attributes)
+            }
+
+        return enums.MessageMediaType.VIDEO, {
+            "video": types.Video._parse(client, doc, video_attributes, file_name, media.ttl_seconds),
+            "has_media_spoiler": media.spoiler
+        }
+    elif raw.types.DocumentAttributeAudio in attributes:
+        audio_attributes = attributes[raw.types.DocumentAttributeAudio]
+
+        if audio_attributes.voice:
+            return enums.MessageMediaType.VOICE, {"voice": types.Voice._parse(client, doc, audio_attributes)}
+
+        return enums.MessageMediaType.AUDIO, {
+            "audio": types.Audio._parse(client, doc, audio_attributes, file_name)
+        }
+
+    return enums.MessageMediaType.DOCUMENT, {"document": types.Document._parse(client, doc, file_name)}
+
+
+async def parse_media_web_page(client, message, media):
+    if not isinstance(media.webpage, raw.types.WebPage):
+        return None
+
+    return enums.MessageMediaType.WEB_PAGE, {"web_page": types.WebPage._parse(client, media.webpage)}
+
+
+async def parse_media_poll(client, message, media):
+    return enums.MessageMediaType.POLL, {"poll": types.Poll._parse(client, media)}
+
+
+async def parse_media_dice(client, message, media):
+    return enums.MessageMediaType.DICE, {"dice": types.Dice._parse(client, media)}
+
+
+MESSAGE_MEDIA_PARSERS = {
+    raw.types.MessageMediaPhoto.ID: parse_media_photo,
+    raw.types.MessageMediaGeo.ID: parse_media_geo,
+    raw.types.MessageMediaContact.ID: parse_media_contact,
+    raw.types.MessageMediaVenue.ID: parse_media_venue,
+    raw.types.MessageMediaGame.ID: parse_media_game,
+    raw.types.MessageMediaDocument.ID: parse_media_document,
+    raw.types.MessageMediaWebPage.ID: parse_media_web_page,
+    raw.types.MessageMediaPoll.ID: parse_media_poll,
+    raw.types.MessageMediaDice.ID: parse_media_dice
+}
+
+REPLY_MARKUP_PARSERS = {
+    raw.types.ReplyKeyboardForceReply.ID: lambda r: types.ForceReply.read(r),
+    raw.types.ReplyKeyboardMarkup.ID: lambda r: types.ReplyKeyboardMarkup.read(r),
+    raw.types.ReplyInlineMarkup.ID: lambda r: types.InlineKeyboardMarkup.read(r),
+    raw.types.ReplyKeyboardHide.ID: lambda r: types.ReplyKeyboardRemove.read(r)
+}
+
+
 class Message(Object, Update):
     """A message.
 
@@ -493,69 +687,12 @@ class Message(Object, Update):
         if isinstance(message, raw.types.MessageService):
             action = message.action
 
-            new_chat_members = None
-            left_chat_member = None
-            new_chat_title = None
-            delete_chat_photo = None
-            migrate_to_chat_id = None
-            migrate_from_chat_id = None
-            group_chat_created = None
-            channel_chat_created = None
-            new_chat_photo = None
-            video_chat_scheduled = None
-            video_chat_started = None
-            video_chat_ended = None
-            video_chat_members_invited = None
-            web_app_data = None
-
-            service_type = None
-
-            if isinstance(action, raw.types.MessageActionChatAddUser):
-                new_chat_members = [types.User._parse(client, users[i]) for i in action.users]
-                service_type = enums.MessageServiceType.NEW_CHAT_MEMBERS
-            elif isinstance(action, raw.types.MessageActionChatJoinedByLink):
-                new_chat_members = [types.User._parse(client, users[utils.get_raw_peer_id(message.from_id)])]
-                service_type = enums.MessageServiceType.NEW_CHAT_MEMBERS
-            elif isinstance(action, raw.types.MessageActionChatDeleteUser):
-                left_chat_member = types.User._parse(client, users[action.user_id])
-                service_type = enums.MessageServiceType.LEFT_CHAT_MEMBERS
-            elif isinstance(action, raw.types.MessageActionChatEditTitle):
-                new_chat_title = action.title
-                service_type = enums.MessageServiceType.NEW_CHAT_TITLE
-            elif isinstance(action, raw.types.MessageActionChatDeletePhoto):
-                delete_chat_photo = True
-                service_type = enums.MessageServiceType.DELETE_CHAT_PHOTO
-            elif isinstance(action, raw.types.MessageActionChatMigrateTo):
-                migrate_to_chat_id = action.channel_id
-                service_type = enums.MessageServiceType.MIGRATE_TO_CHAT_ID
-            elif isinstance(action, raw.types.MessageActionChannelMigrateFrom):
-                migrate_from_chat_id = action.chat_id
-                service_type = enums.MessageServiceType.MIGRATE_FROM_CHAT_ID
-            elif isinstance(action, raw.types.MessageActionChatCreate):
-                group_chat_created = True
-                service_type = enums.MessageServiceType.GROUP_CHAT_CREATED
-            elif isinstance(action, raw.types.MessageActionChannelCreate):
-                channel_chat_created = True
-                service_type = enums.MessageServiceType.CHANNEL_CHAT_CREATED
-            elif isinstance(action, raw.types.MessageActionChatEditPhoto):
-                new_chat_photo = types.Photo._parse(client, action.photo)
-                service_type = enums.MessageServiceType.NEW_CHAT_PHOTO
-            elif isinstance(action, raw.types.MessageActionGroupCallScheduled):
-                video_chat_scheduled = types.VideoChatScheduled._parse(action)
-                service_type = enums.MessageServiceType.VIDEO_CHAT_SCHEDULED
-            elif isinstance(action, raw.types.MessageActionGroupCall):
-                if action.duration:
-                    video_chat_ended = types.VideoChatEnded._parse(action)
-                    service_type = enums.MessageServiceType.VIDEO_CHAT_ENDED
-                else:
-                    video_chat_started = types.VideoChatStarted()
-                    service_type = enums.MessageServiceType.VIDEO_CHAT_STARTED
-            elif isinstance(action, raw.types.MessageActionInviteToGroupCall):
-                video_chat_members_invited = types.VideoChatMembersInvited._parse(client, action, users)
-                service_type = enums.MessageServiceType.VIDEO_CHAT_MEMBERS_INVITED
-            elif isinstance(action, raw.types.MessageActionWebViewDataSentMe):
-                web_app_data = types.WebAppData._parse(action)
-                service_type = enums.MessageServiceType.WEB_APP_DATA
+            parse_action = MESSAGE_ACTION_PARSERS.get(action.ID, None)
+            service_type, service_fields = (
+                parse_action(client, message, action, users)
+                if parse_action is not None
+                else (None, {})
+            )
 
             from_user = types.User._parse(client, users.get(user_id, None))
             sender_chat = types.Chat._parse(client, message, users, chats, is_chat=False) if not from_user else None
@@ -567,22 +704,9 @@ class Message(Object, Update):
                 from_user=from_user,
                 sender_chat=sender_chat,
                 service=service_type,
-                new_chat_members=new_chat_members,
-                left_chat_member=left_chat_member,
-                new_chat_title=new_chat_title,
-                new_chat_photo=new_chat_photo,
-                delete_chat_photo=delete_chat_photo,
-                migrate_to_chat_id=utils.get_channel_id(migrate_to_chat_id) if migrate_to_chat_id else None,
-                migrate_from_chat_id=-migrate_from_chat_id if migrate_from_chat_id else None,
-                group_chat_created=group_chat_created,
-                channel_chat_created=channel_chat_created,
-                video_chat_scheduled=video_chat_scheduled,
-                video_chat_started=video_chat_started,
-                video_chat_ended=video_chat_ended,
-                video_chat_members_invited=video_chat_members_invited,
-                web_app_data=web_app_data,
-                client=client
+                client=client,
                 # TODO: supergroup_chat_created
+                **service_fields
             )
 
             if isinstance(action, raw.types.MessageActionPinMessage):
@@ -645,113 +769,26 @@ class Message(Object, Update):
                 elif forward_header.from_name:
                     forward_sender_name = forward_header.from_name
 
-            photo = None
-            location = None
-            contact = None
-            venue = None
-            game = None
-            audio = None
-            voice = None
-            animation = None
-            video = None
-            video_note = None
-            sticker = None
-            document = None
-            web_page = None
-            poll = None
-            dice = None
-
             media = message.media
             media_type = None
-            has_media_spoiler = None
+            media_fields = {}
 
             if media:
-                if isinstance(media, raw.types.MessageMediaPhoto):
-                    photo = types.Photo._parse(client, media.photo, media.ttl_seconds)
-                    media_type = enums.MessageMediaType.PHOTO
-                    has_media_spoiler = media.spoiler
-                elif isinstance(media, raw.types.MessageMediaGeo):
-                    location = types.Location._parse(client, media.geo)
-                    media_type = enums.MessageMediaType.LOCATION
-                elif isinstance(media, raw.types.MessageMediaContact):
-                    contact = types.Contact._parse(client, media)
-                    media_type = enums.MessageMediaType.CONTACT
-                elif isinstance(media, raw.types.MessageMediaVenue):
-                    venue = types.Venue._parse(client, media)
-                    media_type = enums.MessageMediaType.VENUE
-                elif isinstance(media, raw.types.MessageMediaGame):
-                    game = types.Game._parse(client, message)
-                    media_type = enums.MessageMediaType.GAME
-                elif isinstance(media, raw.types.MessageMediaDocument):
-                    doc = media.document
-
-                    if isinstance(doc, raw.types.Document):
-                        attributes = {type(i): i for i in doc.attributes}
-
-                        file_name = getattr(
-                            attributes.get(
-                                raw.types.DocumentAttributeFilename, None
-                            ), "file_name", None
-                        )
+                parse_media = MESSAGE_MEDIA_PARSERS.get(media.ID, None)
+                parsed_media = await parse_media(client, message, media) if parse_media is not None else None
 
-                        if raw.types.DocumentAttributeAnimated in attributes:
-                            video_attributes = attributes.get(raw.types.DocumentAttributeVideo, None)
-                            animation = types.Animation._parse(client, doc, video_attributes, file_name)
-                            media_type = enums.MessageMediaType.ANIMATION
-                            has_media_spoiler = media.spoiler
-                        elif raw.types.DocumentAttributeSticker in attributes:
-                            sticker = await types.Sticker._parse(client, doc, attributes)
-                            media_type = enums.MessageMediaType.STICKER
-                        elif raw.types.DocumentAttributeVideo in attributes:
-                            video_attributes = attributes[raw.types.DocumentAttributeVideo]
-
-                            if video_attributes.round_message:
-                                video_note = types.VideoNote._parse(client, doc, video_attributes)
-                                media_type = enums.MessageMediaType.VIDEO_NOTE
-                            else:
-                                video = types.Video._parse(client, doc, video_attributes, file_name, media.ttl_seconds)
-                                media_type = enums.MessageMediaType.VIDEO
-                                has_media_spoiler = media.spoiler
-                        elif raw.types.DocumentAttributeAudio in attributes:
-                            audio_attributes = attributes[raw.types.DocumentAttributeAudio]
-
-                            if audio_attributes.voice:
-                                voice = types.Voice._parse(client, doc, audio_attributes)
-                                media_type = enums.MessageMediaType.VOICE
-                            else:
-                                audio = types.Audio._parse(client, doc, audio_attributes, file_name)
-                                media_type = enums.MessageMediaType.AUDIO
-                        else:
-                            document = types.Document._parse(client, doc, file_name)
-                            media_type = enums.MessageMediaType.DOCUMENT
-                elif isinstance(media, raw.types.MessageMediaWebPage):
-                    if isinstance(media.webpage, raw.types.WebPage):
-                        web_page = types.WebPage._parse(client, media.webpage)
-                        media_type = enums.MessageMediaType.WEB_PAGE
-                    else:
-                        media = None
-                elif isinstance(media, raw.types.MessageMediaPoll):
-                    poll = types.Poll._parse(client, media)
-                    media_type = enums.MessageMediaType.POLL
-                elif isinstance(media, raw.types.MessageMediaDice):
-                    dice = types.Dice._parse(client, media)
-                    media_type = enums.MessageMediaType.DICE
+                if parsed_media is not None:
+                    media_type, media_fields = parsed_media
                 else:
                     media = None
 
+            web_page = media_fields.get("web_page", None)
+
             reply_markup = message.reply_markup
 
             if reply_markup:
-                if isinstance(reply_markup, raw.types.ReplyKeyboardForceReply):
-                    reply_markup = types.ForceReply.read(reply_markup)
-                elif isinstance(reply_markup, raw.types.ReplyKeyboardMarkup):
-                    reply_markup = types.ReplyKeyboardMarkup.read(reply_markup)
-                elif isinstance(reply_markup, raw.types.ReplyInlineMarkup):
-                    reply_markup = types.InlineKeyboardMarkup.read(reply_markup)
-                elif isinstance(reply_markup, raw.types.ReplyKeyboardHide):
-                    reply_markup = types.ReplyKeyboardRemove.read(reply_markup)
-                else:
-                    reply_markup = None
+                parse_reply_markup = REPLY_MARKUP_PARSERS.get(reply_markup.ID, None)
+                reply_markup = parse_reply_markup(reply_markup) if parse_reply_markup is not None else None
 
             from_user = types.User._parse(client, users.get(user_id, None))
             sender_chat = types.Chat._parse(client, message, users, chats, is_chat=False) if not from_user else None
@@ -786,7 +823,6 @@ class Message(Object, Update):
                 ),
                 author_signature=message.post_author,
                 has_protected_content=message.noforwards,
-                has_media_spoiler=has_media_spoiler,
                 forward_from=forward_from,
                 forward_sender_name=forward_sender_name,
                 forward_from_chat=forward_from_chat,
@@ -799,28 +835,14 @@ class Message(Object, Update):
                 media=media_type,
                 edit_date=utils.timestamp_to_datetime(message.edit_date),
                 media_group_id=message.grouped_id,
-                photo=photo,
-                location=location,
-                contact=contact,
-                venue=venue,
-                audio=audio,
-                voice=voice,
-                animation=animation,
-                game=game,
-                video=video,
-                video_note=video_note,
-                sticker=sticker,
-                document=document,
-                web_page=web_page,
-                poll=poll,
-                dice=dice,
                 views=message.views,
                 forwards=message.forwards,
                 via_bot=types.User._parse(client, users.get(message.via_bot_id, None)),
                 outgoing=message.out,
                 reply_markup=reply_markup,
                 reactions=reactions,
-                client=client
+                client=client,
+                **media_fields
             )
 
             if message.reply_to:
@@ -832,6 +854,9 @@ class Message(Object, Update):
                         key = (parsed_message.chat.id, parsed_message.reply_to_message_id)
                         reply_to_message = client.message_cache[key]
 
+                        if not reply_to_message:
+                            reply_to_message = await utils.get_stored_message(client, *key, replies=replies - 1)
+
                         if not reply_to_message:
                             reply_to_message = await client.get_messages(
                                 parsed_message.chat.id,
@@ -133,6 +133,25 @@ async def parse_messages(
     return types.List(parsed_messages)
 
 
+async def get_stored_message(
+    client,
+    chat_id: int,
+    message_id: int,
+    replies: int = 1
+) -> Optional["types.Message"]:
+    if not client.message_store:
+        return None
+
+    r = await client.message_store.get(chat_id, message_id)
+
+    if r is None:
+        return None
+
+    messages = await parse_messages(client, r, replies=replies)
+
+    return messages[0] if messages else None
+
+
 def parse_deleted_messages(client, update) -> List["types.Message"]:
     messages = update.messages
     channel_id = getattr(update, "channel_id", None)
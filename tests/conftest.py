@@ -0,0 +1,124 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+
+import pytest
+
+from pyrogram.methods.advanced.invoke import Invoke
+from pyrogram.methods.advanced.invoke_ordered import InvokeOrdered
+from pyrogram.session import Session
+from pyrogram.session.internals import FloodWaitRegistry
+
+AUTH_KEY = bytes(range(256))
+
+
+class Connection:
+    """Records the packets a session sends instead of sending them"""
+
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, data: bytes):
+        self.sent.append(data)
+
+    async def close(self):
+        pass
+
+
+class Client:
+    """Stands for the client owning real sessions, which records the updates they receive"""
+
+    name = "test"
+    lazy_decoding = False
+
+    def __init__(self, storage=None):
+        self.storage = storage
+        self.flood_waits = FloodWaitRegistry()
+        self.updates = []
+
+    async def handle_updates(self, updates):
+        self.updates.append(updates)
+
+
+class FakeSession:
+    """Stands for a session client methods invoke functions through, with pending requests and the invoked ones"""
+
+    def __init__(self, pending: int = 0, started: bool = True):
+        self.results = dict.fromkeys(range(pending))
+        self.is_started = asyncio.Event()
+        self.queries = []
+
+        if started:
+            self.is_started.set()
+
+    async def invoke(self, query, *args):
+        self.queries.append(query)
+
+        # Long enough for concurrent calls to overlap
+        await asyncio.sleep(0.01)
+
+        return object()
+
+    async def send_ordered(self, queries, timeout=None):
+        self.queries.extend(queries)
+
+        async def result(i):
+            return i
+
+        return [result(i) for i in range(len(queries))]
+
+
+class FakeClient(Invoke, InvokeOrdered):
+    """Stands for a started client, which only has the methods under test"""
+
+    def __init__(self, session: FakeSession = None, session_pool: list = None):
+        self.loop = asyncio.get_event_loop()
+        self.is_connected = True
+        self.no_updates = False
+        self.takeout_id = None
+        self.sleep_threshold = 10
+        self.session = session or FakeSession()
+        self.session_pool = session_pool or []
+        self.coalesce_requests = False
+        self.inflight_requests = {}
+        self.flood_waits = FloodWaitRegistry()
+
+    async def fetch_peers(self, peers):
+        pass
+
+
+@pytest.fixture
+def fake_session():
+    return FakeSession
+
+
+@pytest.fixture
+def client():
+    return FakeClient
+
+
+@pytest.fixture
+def session():
+    def session(storage=None, auth_key: bytes = AUTH_KEY) -> Session:
+        s = Session(Client(storage), 2, auth_key, False)
+        s.connection = Connection()
+
+        return s
+
+    return session
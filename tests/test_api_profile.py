@@ -0,0 +1,116 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+
+import pytest
+
+from compiler.api.compiler import Combinator, get_profile
+from pyrogram import Client, raw
+from pyrogram.raw.core import UnknownObject
+
+
+def combinator(section: str, qualname: str, args: list, qualtype: str) -> Combinator:
+    namespace, name = qualname.split(".") if "." in qualname else ("", qualname)
+    typespace, type = qualtype.split(".") if "." in qualtype else ("", qualtype)
+
+    return Combinator(
+        section=section,
+        qualname=qualname,
+        namespace=namespace,
+        name=name,
+        id="0x00000000",
+        has_flags=False,
+        args=args,
+        qualtype=qualtype,
+        typespace=typespace,
+        type=type
+    )
+
+
+COMBINATORS = [
+    combinator("types", "InputPeerSelf", [], "InputPeer"),
+    combinator("types", "InputPeerUser", [("user_id", "long")], "InputPeer"),
+    combinator("types", "PeerUser", [("user_id", "long")], "Peer"),
+    combinator("types", "Message", [("flags", "#"), ("from_id", "flags.8?Peer")], "Message"),
+    combinator("types", "messages.Messages", [("messages", "Vector<Message>")], "messages.Messages"),
+    combinator("types", "Photo", [("id", "long")], "Photo"),
+    combinator("functions", "messages.GetHistory", [("peer", "InputPeer")], "messages.Messages"),
+    combinator("functions", "photos.GetUserPhotos", [("user_id", "InputPeer")], "Photo")
+]
+
+
+def test_closure():
+    selected = {c.qualname for c in get_profile(COMBINATORS, ["messages.getHistory"])}
+
+    assert selected == {
+        "messages.GetHistory", "InputPeerSelf", "InputPeerUser", "messages.Messages", "Message", "PeerUser"
+    }
+
+
+def test_type_entry():
+    selected = {c.qualname for c in get_profile(COMBINATORS, ["InputPeer", "Photo"])}
+
+    assert selected == {"InputPeerSelf", "InputPeerUser", "Photo"}
+
+
+class Updates:
+    """Stands for a client receiving updates the API build can't decode"""
+
+    handle_updates = Client.handle_updates
+    fetch_difference = Client.fetch_difference
+
+    def __init__(self):
+        self.updates_state = (10, 100)
+        self.dispatcher = type("Dispatcher", (), {"updates_queue": asyncio.Queue()})()
+        self.queries = []
+
+    async def fetch_peers(self, peers):
+        return False
+
+    async def invoke(self, query):
+        self.queries.append(query)
+        state = raw.types.updates.State(pts=12, qts=0, date=200, seq=0, unread_count=0)
+        message = raw.types.Message(id=1, peer_id=raw.types.PeerUser(user_id=2), date=150, message="hi")
+
+        if len(self.queries) == 1:
+            return raw.types.updates.DifferenceSlice(
+                new_messages=[message], new_encrypted_messages=[], other_updates=[], chats=[], users=[],
+                intermediate_state=state
+            )
+
+        return raw.types.updates.Difference(
+            new_messages=[], new_encrypted_messages=[], other_updates=[raw.types.UpdateConfig()], chats=[], users=[],
+            state=raw.types.updates.State(pts=13, qts=0, date=210, seq=0, unread_count=0)
+        )
+
+
+@pytest.mark.asyncio
+async def test_unknown_updates():
+    client = Updates()
+
+    await client.handle_updates(UnknownObject(bytes.fromhex("01020304") + b"data"))
+
+    assert [(q.pts, q.date) for q in client.queries] == [(10, 100), (12, 200)]
+    assert client.updates_state == (13, 210)
+
+    update, _, _ = client.dispatcher.updates_queue.get_nowait()
+    assert update.message.message == "hi"
+
+    update, _, _ = client.dispatcher.updates_queue.get_nowait()
+    assert isinstance(update, raw.types.UpdateConfig)
@@ -0,0 +1,83 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import time
+
+from pyrogram.client import Cache
+
+
+def test_lru():
+    cache = Cache(3)
+
+    for i in range(3):
+        cache[(1, i)] = i
+
+    assert cache[(1, 0)] == 0  # (1, 0) becomes the most recently used entry
+
+    cache[(1, 3)] = 3
+
+    assert (1, 1) not in cache
+    assert cache[(1, 0)] == 0
+    assert len(cache) == 3
+    assert cache.evictions == 1
+
+
+def test_counters():
+    cache = Cache(10)
+    cache[(1, 1)] = "a"
+
+    assert cache[(1, 1)] == "a"
+    assert cache[(1, 2)] is None
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.hit_rate == 0.5
+
+
+def test_ttl(monkeypatch):
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+
+    cache = Cache(10, ttl=60)
+    cache[(1, 1)] = "a"
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 61)
+
+    assert cache[(1, 1)] is None
+    assert len(cache) == 0
+
+
+def test_chat_capacity():
+    cache = Cache(100, chat_capacity=2)
+
+    for i in range(5):
+        cache[(1, i)] = i
+        cache[(2, i)] = i
+
+    assert sorted(cache.store) == [(1, 3), (1, 4), (2, 3), (2, 4)]
+
+
+def test_max_size():
+    cache = Cache(100, max_size=Cache.get_size("x" * 1000) * 3)
+
+    for i in range(10):
+        cache[(1, i)] = "x" * 1000
+
+    assert len(cache) == 3
+    assert cache.size <= cache.max_size
+    assert cache.pop((1, 9)) == "x" * 1000
+    assert len(cache) == 2
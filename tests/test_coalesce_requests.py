@@ -0,0 +1,82 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+import asyncio
+
+import pytest
+
+from pyrogram import raw
+
+
+def get_full_user(user_id: int):
+    return raw.functions.users.GetFullUser(id=raw.types.InputUser(user_id=user_id, access_hash=0))
+
+
+@pytest.mark.asyncio
+async def test_coalesce(client):
+    app = client()
+    app.coalesce_requests = True
+
+    r = await asyncio.gather(*[app.invoke(get_full_user(1)) for _ in range(5)], app.invoke(get_full_user(2)))
+
+    assert len(app.session.queries) == 2
+    assert r[0] is r[4] and r[0] is not r[5]
+    assert not app.inflight_requests
+
+    # Only concurrent calls are coalesced
+    await app.invoke(get_full_user(1))
+
+    assert len(app.session.queries) == 3
+
+
+@pytest.mark.asyncio
+async def test_not_coalesced(client):
+    app = client()
+    app.coalesce_requests = True
+    query = raw.functions.messages.SendMessage(peer=raw.types.InputPeerSelf(), message="hi", random_id=1)
+
+    await asyncio.gather(*[app.invoke(query) for _ in range(2)])
+
+    assert len(app.session.queries) == 2
+
+    app.coalesce_requests = False
+
+    await asyncio.gather(*[app.invoke(get_full_user(1)) for _ in range(2)])
+
+    assert len(app.session.queries) == 4
+
+    # Calls with different arguments are sent on their own
+    app.coalesce_requests = True
+
+    await asyncio.gather(app.invoke(get_full_user(1)), app.invoke(get_full_user(1), timeout=60))
+
+    assert len(app.session.queries) == 6
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller(client):
+    app = client()
+    app.coalesce_requests = True
+
+    first = asyncio.create_task(app.invoke(get_full_user(1)))
+    second = asyncio.create_task(app.invoke(get_full_user(1)))
+    await asyncio.sleep(0)
+
+    first.cancel()
+
+    assert await second is not None
+    assert len(app.session.queries) == 1
@@ -0,0 +1,119 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+import asyncio
+import time
+
+import pytest
+
+from pyrogram import raw
+from pyrogram.errors import FloodWait
+from pyrogram.session.internals import FloodWaitRegistry
+
+
+def send_message(user_id: int):
+    return raw.functions.messages.SendMessage(
+        peer=raw.types.InputPeerUser(user_id=user_id, access_hash=0),
+        message="hi",
+        random_id=1
+    )
+
+
+def test_registry(monkeypatch):
+    registry = FloodWaitRegistry()
+    method, peer = registry.get_target(send_message(1))
+    _, other_peer = registry.get_target(send_message(2))
+
+    assert method == "messages.SendMessage"
+
+    registry.add(method, peer, 30)
+
+    assert 29 < registry.remaining(method, peer) <= 30
+    assert registry.remaining(method, other_peer) == 0
+    assert registry.remaining("messages.GetMessages") == 0
+
+    # A wait observed without a peer applies to all of them
+    registry.add(method, None, 60)
+
+    assert registry.remaining(method, other_peer) > 59
+
+    monkeypatch.setattr(time, "monotonic", lambda: float("inf"))
+
+    assert registry.remaining(method, peer) == 0
+    assert not registry.deadlines
+
+    stats = registry.stats[method]
+
+    assert (stats.flood_waits, stats.total_wait, stats.max_wait) == (2, 90, 60)
+
+
+@pytest.mark.asyncio
+async def test_shared_flood_wait(session):
+    s = session()
+    s.is_started.set()
+    sent = []
+
+    async def send(query, *args, **kwargs):
+        sent.append(query)
+
+        if len(sent) == 1:
+            raise FloodWait(100)
+
+        return query
+
+    s.send = send
+
+    with pytest.raises(FloodWait):
+        await s.invoke(send_message(1), sleep_threshold=10)
+
+    # Further calls for the same peer fail right away, without reaching Telegram
+    with pytest.raises(FloodWait) as e:
+        await s.invoke(send_message(1), sleep_threshold=10)
+
+    assert 99 <= e.value.value <= 100
+    assert len(sent) == 1
+
+    await s.invoke(send_message(2), sleep_threshold=10)
+
+    assert len(sent) == 2
+
+    stats = s.client.flood_waits.stats["messages.SendMessage"]
+
+    assert (stats.flood_waits, stats.parked_calls) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_parked_call(monkeypatch, session):
+    s = session()
+    s.is_started.set()
+    sleeps = []
+
+    async def send(query, *args, **kwargs):
+        return query
+
+    async def sleep(delay):
+        sleeps.append(delay)
+
+    s.send = send
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+
+    method, peer = FloodWaitRegistry.get_target(send_message(1))
+    s.client.flood_waits.add(method, peer, 5)
+
+    await s.invoke(send_message(1), sleep_threshold=10)
+
+    assert len(sleeps) == 1 and 4 < sleeps[0] <= 5
@@ -0,0 +1,45 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+import asyncio
+
+import pytest
+
+from pyrogram import raw
+from pyrogram.errors import FloodWait
+
+
+@pytest.mark.asyncio
+async def test_invoke_ordered(client):
+    app = client()
+    app.no_updates = True
+
+    tasks = await app.invoke_ordered(raw.functions.Ping(ping_id=i) for i in range(3))
+
+    assert await asyncio.gather(*tasks) == [0, 1, 2]
+    assert [query.query.ping_id for query in app.session.queries] == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_invoke_ordered_flood_wait(client):
+    app = client()
+    app.flood_waits.add("Ping", None, 60)
+
+    with pytest.raises(FloodWait):
+        await app.invoke_ordered([raw.functions.Ping(ping_id=0)])
+
+    assert not app.session.queries
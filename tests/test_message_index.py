@@ -0,0 +1,121 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import pytest
+
+from pyrogram import raw
+from pyrogram.methods.messages.search_local_messages import SearchLocalMessages
+from pyrogram.storage import MessageIndex
+
+
+def message(message_id: int, text: str, chat_id: int = 1) -> raw.types.Message:
+    return raw.types.Message(
+        id=message_id,
+        peer_id=raw.types.PeerUser(user_id=chat_id),
+        date=message_id,
+        message=text
+    )
+
+
+@pytest.mark.asyncio
+async def test_search():
+    index = MessageIndex(":memory:")
+    await index.open()
+
+    await index.put(message(1, "Hello world"))
+    await index.put(message(2, "hello there", chat_id=2))
+    await index.put(message(3, "Café au lait"))
+
+    assert await index.search("hello") == [(2, 2), (1, 1)]
+    assert await index.search("hello", chat_id=1) == [(1, 1)]
+    assert await index.search("cafe") == [(1, 3)]
+    assert await index.search("hello", limit=1, offset=1) == [(1, 1)]
+
+    await index.close()
+
+
+@pytest.mark.asyncio
+async def test_edit_and_delete():
+    index = MessageIndex(":memory:")
+    await index.open()
+
+    await index.put(message(1, "hello"))
+    await index.put(message(1, "goodbye"))
+
+    assert await index.search("hello") == []
+    assert await index.search("goodbye") == [(1, 1)]
+
+    await index.delete(None, [1])
+
+    assert await index.search("goodbye") == []
+
+    await index.close()
+
+
+@pytest.mark.asyncio
+async def test_tokenizer():
+    index = MessageIndex(":memory:", tokenize="trigram")
+    await index.open()
+
+    await index.put(message(1, "unbelievable"))
+
+    assert await index.search("liev") == [(1, 1)]
+
+    await index.close()
+
+
+class Message:
+    def __init__(self, message_id: int, empty: bool):
+        self.id = message_id
+        self.empty = empty
+
+
+class Cache(dict):
+    def __getitem__(self, key):
+        return self.get(key)
+
+
+class Client(SearchLocalMessages):
+    message_store = None
+
+    def __init__(self, index: MessageIndex, deleted: set):
+        self.message_index = index
+        self.message_cache = Cache()
+        self.deleted = deleted
+
+    async def get_messages(self, chat_id, message_ids, replies=1):
+        return [Message(i, i in self.deleted) for i in message_ids]
+
+
+@pytest.mark.asyncio
+async def test_search_local_messages_pagination():
+    index = MessageIndex(":memory:")
+    await index.open()
+
+    for i in range(1, 251):
+        await index.put(message(i, "hello"))
+
+    # The whole first page was deleted on Telegram, which must not shift the following pages
+    client = Client(index, set(range(151, 251)))
+    found = [m.id async for m in client.search_local_messages("hello")]
+
+    assert found == list(range(150, 0, -1))
+    assert await index.search("hello", limit=1) == [(1, 150)]
+
+    await index.close()
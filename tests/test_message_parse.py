@@ -0,0 +1,84 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from io import BytesIO
+from types import SimpleNamespace
+
+import pytest
+
+from pyrogram import raw, types, enums
+from pyrogram.raw.core import TLObject
+
+
+def received(obj: TLObject) -> TLObject:
+    return TLObject.read(BytesIO(obj.write()))
+
+
+def client() -> SimpleNamespace:
+    return SimpleNamespace(message_cache={}, me=None)
+
+
+def users() -> dict:
+    return {1: received(raw.types.User(id=1, first_name="user", access_hash=0))}
+
+
+def message(media: TLObject) -> TLObject:
+    return received(raw.types.Message(
+        id=2,
+        peer_id=raw.types.PeerUser(user_id=1),
+        from_id=raw.types.PeerUser(user_id=1),
+        date=3,
+        message="hello",
+        media=media
+    ))
+
+
+@pytest.mark.asyncio
+async def test_media():
+    parsed = await types.Message._parse(client(), message(raw.types.MessageMediaDice(value=3, emoticon="x")), users(), {})
+
+    assert parsed.media == enums.MessageMediaType.DICE
+    assert parsed.dice.value == 3
+    assert parsed.caption == "hello"
+    assert parsed.text is None
+
+
+@pytest.mark.asyncio
+async def test_unsupported_media():
+    parsed = await types.Message._parse(client(), message(raw.types.MessageMediaUnsupported()), users(), {})
+
+    assert parsed.media is None
+    assert parsed.text == "hello"
+
+
+@pytest.mark.asyncio
+async def test_service():
+    service = received(raw.types.MessageService(
+        id=2,
+        peer_id=raw.types.PeerUser(user_id=1),
+        from_id=raw.types.PeerUser(user_id=1),
+        date=3,
+        action=raw.types.MessageActionChatMigrateTo(channel_id=4)
+    ))
+
+    parsed = await types.Message._parse(client(), service, users(), {})
+
+    assert parsed.service == enums.MessageServiceType.MIGRATE_TO_CHAT_ID
+    assert parsed.migrate_to_chat_id == -1000000000004
+    assert parsed.new_chat_title is None
@@ -0,0 +1,110 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import pytest
+
+from pyrogram import raw
+from pyrogram.storage import MessageStore
+
+
+def message(message_id: int, chat_id: int = 1, grouped_id: int = None, text: str = "") -> raw.types.Message:
+    return raw.types.Message(
+        id=message_id,
+        peer_id=raw.types.PeerUser(user_id=chat_id),
+        from_id=raw.types.PeerUser(user_id=2),
+        date=0,
+        message=text,
+        grouped_id=grouped_id
+    )
+
+
+def user(user_id: int) -> raw.types.User:
+    return raw.types.User(id=user_id, access_hash=0, first_name=str(user_id))
+
+
+@pytest.mark.asyncio
+async def test_put_get():
+    store = MessageStore(":memory:")
+    await store.open()
+
+    users = {i: user(i) for i in (1, 2, 3)}
+    await store.put(message(10), users, {})
+
+    r = await store.get(1, 10)
+
+    assert r.messages[0].write() == message(10).write()
+    assert sorted(u.id for u in r.users) == [1, 2]
+    assert await store.get(1, 11) is None
+
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_media_group_and_delete():
+    store = MessageStore(":memory:")
+    await store.open()
+
+    for i in range(10, 13):
+        await store.put(message(i, grouped_id=5), {}, {})
+
+    await store.put(message(13), {}, {})
+
+    # Whether the group starts at 10 is unknown until the message before it is stored
+    assert await store.get_media_group(1, 11) == []
+
+    await store.put(message(9), {}, {})
+
+    assert [r.messages[0].id for r in await store.get_media_group(1, 11)] == [10, 11, 12]
+    assert await store.get_media_group(1, 13) == []
+
+    await store.delete(None, [11])
+
+    # Partially stored groups are not returned
+    assert await store.get_media_group(1, 12) == []
+
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_retention():
+    store = MessageStore(":memory:", max_size=10000)
+    await store.open()
+
+    for i in range(1, 501):
+        await store.put(message(i, text="x" * 100), {}, {})
+
+    assert store.get_size() <= 10000
+    assert store.size == store.get_size()
+    assert await store.get(1, 1) is None
+    assert await store.get(1, 500) is not None
+
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_replace_size():
+    store = MessageStore(":memory:")
+    await store.open()
+
+    for text in ("x" * 1000, "y", "z" * 500):
+        await store.put(message(1, text=text), {}, {})
+
+    assert store.size == store.get_size()
+
+    await store.close()
@@ -0,0 +1,68 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import subprocess
+import sys
+
+import pytest
+
+from pyrogram import raw
+from pyrogram.raw.all import objects, paths
+
+
+def test_lazy_namespace():
+    code = (
+        "import sys\n"
+        "from pyrogram import raw\n"
+        "assert 'pyrogram.raw.types.update_short_message' not in sys.modules\n"
+        "raw.types.UpdateShortMessage\n"
+        "assert 'pyrogram.raw.types.update_short_message' in sys.modules\n"
+    )
+
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_namespace_attributes():
+    assert raw.types.messages.Messages.QUALNAME == "types.messages.Messages"
+    assert "UpdateShortMessage" in dir(raw.types)
+
+    with pytest.raises(AttributeError):
+        raw.types.DoesNotExist
+
+
+def test_star_import():
+    namespace = {}
+    exec("from pyrogram.raw.functions.messages import *", namespace)
+
+    assert namespace["SendMessage"] is raw.functions.messages.SendMessage
+
+    for module, name in (("pyrogram.raw.types", "InputPeerSelf"), ("pyrogram.raw.base", "InputPeer")):
+        namespace = {}
+        exec(f"from {module} import *", namespace)
+
+        assert "messages" in namespace and name in namespace
+
+
+def test_lazy_objects():
+    assert objects[raw.functions.Ping.ID] is raw.functions.Ping
+    assert objects[0x1cb5c415] is raw.core.Vector
+    assert len(paths) >= len(objects)
+
+    with pytest.raises(KeyError):
+        objects[0]
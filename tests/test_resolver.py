@@ -0,0 +1,180 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import asyncio
+
+import pytest
+
+from pyrogram import raw
+from pyrogram.errors import FloodWait, PeerIdInvalid, UsernameNotOccupied
+from pyrogram.resolver import Resolver
+
+
+class Storage:
+    def __init__(self):
+        self.usernames = {}
+        self.expired_usernames = {}
+
+    async def get_peer_by_username(self, username):
+        try:
+            return self.usernames[username]
+        except KeyError:
+            raise KeyError(f"Username not found: {username}")
+
+    async def get_expired_peer_by_username(self, username):
+        try:
+            return self.expired_usernames[username]
+        except KeyError:
+            raise KeyError(f"Username not found: {username}")
+
+
+class Client:
+    def __init__(self):
+        self.loop = asyncio.get_event_loop()
+        self.storage = Storage()
+        self.requests = []
+
+    async def invoke(self, query):
+        self.requests.append(query)
+
+        if isinstance(query, raw.functions.contacts.ResolveUsername):
+            if query.username == "missing":
+                raise UsernameNotOccupied()
+
+            self.storage.usernames[query.username] = raw.types.InputPeerUser(user_id=1, access_hash=1)
+
+        return []
+
+    async def fetch_peers(self, peers):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_batch():
+    client = Client()
+    resolver = Resolver(client)
+
+    await asyncio.gather(*[resolver.fetch_peer(i) for i in range(1, 301)])
+
+    assert len(client.requests) == 2
+    assert all(isinstance(r, raw.functions.users.GetUsers) for r in client.requests)
+    assert sorted(len(r.id) for r in client.requests) == [100, 200]
+
+
+@pytest.mark.asyncio
+async def test_batch_errors():
+    client = Client()
+    resolver = Resolver(client)
+    invoke = client.invoke
+
+    async def invalid_id(query):
+        await invoke(query)
+
+        if any(peer.user_id == 13 for peer in query.id):
+            raise PeerIdInvalid()
+
+    client.invoke = invalid_id
+    results = await asyncio.gather(*[resolver.fetch_peer(i) for i in range(1, 65)], return_exceptions=True)
+
+    # The batch is split in halves down to the invalid id: 1 + 2 * log2(64) requests
+    assert [i for i, r in enumerate(results, 1) if r is not None] == [13]
+    assert isinstance(results[12], PeerIdInvalid)
+    assert len(client.requests) == 13
+
+    async def flood_wait(query):
+        await invoke(query)
+        raise FloodWait(10)
+
+    client.invoke = flood_wait
+    results = await asyncio.gather(*[resolver.fetch_peer(i) for i in range(1, 65)], return_exceptions=True)
+
+    assert all(isinstance(r, FloodWait) for r in results)
+    assert len(client.requests) == 14
+
+
+@pytest.mark.asyncio
+async def test_peer_kinds():
+    client = Client()
+    resolver = Resolver(client)
+
+    await asyncio.gather(
+        resolver.fetch_peer(1),
+        resolver.fetch_peer(-1),
+        resolver.fetch_peer(-1000000000001),
+        resolver.fetch_peer(2)
+    )
+
+    assert sorted(type(r).__name__ for r in client.requests) == ["GetChannels", "GetChats", "GetUsers"]
+
+
+@pytest.mark.asyncio
+async def test_dedup():
+    client = Client()
+    resolver = Resolver(client)
+
+    await asyncio.gather(*[resolver.fetch_peer(1) for _ in range(10)])
+
+    assert len(client.requests) == 1
+    assert len(client.requests[0].id) == 1
+
+
+@pytest.mark.asyncio
+async def test_username_missing():
+    client = Client()
+    resolver = Resolver(client)
+
+    for _ in range(3):
+        with pytest.raises(UsernameNotOccupied):
+            await resolver.resolve_username("missing")
+
+    assert len(client.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_username_stale():
+    client = Client()
+    resolver = Resolver(client)
+    resolver.RESOLVE_USERNAME_INTERVAL = 0
+
+    peer = await resolver.resolve_username("username")
+    assert len(client.requests) == 1
+
+    # Simulate the storage entry expiring: the cached peer is served while a refresh runs in the background
+    client.storage.usernames.clear()
+
+    assert await resolver.resolve_username("username") == peer
+    await asyncio.sleep(0.01)
+    assert len(client.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_username_stale_storage():
+    client = Client()
+    resolver = Resolver(client)
+
+    # A fresh process only has the expired entry left in storage: it is served while a refresh runs in the background
+    peer = raw.types.InputPeerUser(user_id=2, access_hash=2)
+    client.storage.expired_usernames["username"] = peer
+
+    assert await resolver.resolve_username("username") == peer
+    assert len(client.requests) == 0
+
+    await asyncio.sleep(0.01)
+    assert len(client.requests) == 1
+    assert await resolver.resolve_username("username") == raw.types.InputPeerUser(user_id=1, access_hash=1)
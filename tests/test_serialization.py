@@ -0,0 +1,288 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha1, sha256
+from io import BytesIO
+from unittest.mock import patch
+
+import pytest
+
+from pyrogram import raw
+from pyrogram.crypto import mtproto
+from pyrogram.crypto.mtproto import kdf
+from pyrogram.raw.core import BufferReader, Int, Long, Message, MsgContainer, TLObject, UnknownObject, Vector
+
+
+def query() -> TLObject:
+    return raw.functions.messages.SendMessage(
+        peer=raw.types.InputPeerSelf(),
+        message="hello",
+        random_id=1,
+        reply_markup=raw.types.ReplyInlineMarkup(
+            rows=[
+                raw.types.KeyboardButtonRow(
+                    buttons=[raw.types.KeyboardButtonCallback(text=str(i), data=b"x") for i in range(5)]
+                ) for _ in range(10)
+            ]
+        ),
+        entities=[raw.types.MessageEntityBold(offset=0, length=5)]
+    )
+
+
+def test_write_into():
+    q = query()
+    b = bytearray(b"prefix")
+    q.write_into(b)
+
+    assert bytes(b) == b"prefix" + q.write()
+    assert TLObject.read(BytesIO(q.write())).write() == q.write()
+
+
+def test_message_length():
+    q = query()
+    message = Message(q, 1, 1, 0)
+    container = MsgContainer([message, Message(raw.functions.Ping(ping_id=0), 2, 2, 0)])
+
+    data = container.write()
+
+    assert message.length == len(q.write())
+    assert TLObject.read(BytesIO(data)).messages[0].body.write() == q.write()
+
+
+def test_size():
+    objects = [
+        query(),
+        raw.types.InputPeerSelf(),
+        raw.types.MessageActionChatCreate(title="é" * 300, users=[1, 2, 3]),
+        raw.types.upload.File(type=raw.types.storage.FilePartial(), mtime=0, bytes=b"x" * 254),
+        raw.types.UpdateShortMessage(id=1, user_id=2, message="hi", pts=3, pts_count=4, date=5, ttl_period=6),
+        raw.functions.InvokeWithLayer(layer=1, query=raw.functions.help.GetConfig()),
+        raw.types.MsgsAllInfo(msg_ids=[1, 2], info=b"abc")
+    ]
+
+    for obj in objects:
+        assert obj._size() == len(obj) == len(obj.write())
+
+    message = Message(query(), 1, 1, 0)
+    container = MsgContainer([message, Message(raw.functions.Ping(ping_id=0), 2, 2, 0)])
+
+    assert message._size() == len(message.write())
+    assert container._size() == len(container.write())
+
+
+def test_fixed_width_run():
+    update = raw.types.UpdateShortMessage(
+        id=-1,
+        user_id=2 ** 63 - 1,
+        message="hi",
+        pts=3,
+        pts_count=-4,
+        date=5,
+        out=True,
+        silent=True,
+        ttl_period=6
+    )
+
+    result = TLObject.read(BytesIO(update.write()))
+
+    assert (result.id, result.user_id, result.pts, result.pts_count, result.date) == (-1, 2 ** 63 - 1, 3, -4, 5)
+    assert result.out and result.silent and not result.mentioned
+    assert result.ttl_period == 6
+    assert result.write() == update.write()
+
+
+def test_buffer_reader():
+    data = bytes(range(256)) * 256
+    small = raw.types.upload.File(type=raw.types.storage.FilePartial(), mtime=0, bytes=b"x" * 100)
+    large = raw.types.upload.File(type=raw.types.storage.FilePartial(), mtime=0, bytes=data)
+
+    assert type(TLObject.read(BufferReader(small.write())).bytes) is bytes
+    assert type(TLObject.read(BytesIO(large.write())).bytes) is bytes
+
+    result = TLObject.read(BufferReader(large.write()))
+
+    assert isinstance(result.bytes, memoryview)
+    assert bytes(result.bytes) == data
+    assert result.write() == large.write()
+    assert str(result) == str(large)
+    assert repr(result) == repr(large)
+
+
+AUTH_KEY = bytes(range(256))
+AUTH_KEY_ID = sha1(AUTH_KEY).digest()[-8:]
+SESSION_ID = b"s" * 8
+
+
+def unpack_outgoing(packed: bytes, zero_copy: bool = False) -> Message:
+    def outgoing_sha256(b: bytes):
+        return sha256(AUTH_KEY[88:88 + 32] if b == AUTH_KEY[96:96 + 32] else b)
+
+    # Read the outgoing message back as if it was an incoming one, using the outgoing key derivation
+    with patch("pyrogram.crypto.mtproto.kdf", lambda k, m, _: kdf(k, m, True)), \
+        patch("pyrogram.crypto.mtproto.sha256", outgoing_sha256):
+        return mtproto.unpack(BytesIO(packed), SESSION_ID, AUTH_KEY, AUTH_KEY_ID, zero_copy)
+
+
+def test_unpack_zero_copy():
+    data = b"y" * (64 * 1024)
+    body = raw.types.upload.File(type=raw.types.storage.FilePartial(), mtime=0, bytes=data)
+    packed = mtproto.pack(Message(body, 1, 1, 0), 0, SESSION_ID, AUTH_KEY, AUTH_KEY_ID)
+
+    message = unpack_outgoing(packed, True)
+
+    assert isinstance(message.body.bytes, memoryview)
+    assert bytes(message.body.bytes) == data
+
+    # As logged by sessions
+    assert "yyy" in str(message)
+
+
+def test_pack_gzip():
+    body = raw.functions.messages.SendMessage(peer=raw.types.InputPeerSelf(), message="x" * 4096, random_id=1)
+    packed = mtproto.pack(Message(body, 1, 1, 0), 0, SESSION_ID, AUTH_KEY, AUTH_KEY_ID, 1024)
+    message = unpack_outgoing(packed)
+
+    assert len(packed) < 1024
+    assert message.length < 1024
+    assert message.body.write() == body.write()
+
+    # Small bodies are left alone
+    body = raw.functions.Ping(ping_id=0)
+    message = unpack_outgoing(mtproto.pack(Message(body, 1, 1, 0), 0, SESSION_ID, AUTH_KEY, AUTH_KEY_ID, 1024))
+
+    assert message.length == len(body.write())
+
+
+def updates() -> TLObject:
+    return raw.types.Updates(
+        updates=[
+            raw.types.UpdateNewMessage(
+                message=raw.types.Message(
+                    id=1,
+                    peer_id=raw.types.PeerUser(user_id=2),
+                    date=3,
+                    message="hello",
+                    entities=[raw.types.MessageEntityBold(offset=0, length=5)]
+                ),
+                pts=4,
+                pts_count=1
+            )
+        ],
+        users=[raw.types.User(id=2, first_name="user", access_hash=5)],
+        chats=[
+            raw.types.Chat(
+                id=6, title="chat", photo=raw.types.ChatPhotoEmpty(), participants_count=1, date=7, version=0
+            )
+        ],
+        date=8,
+        seq=0
+    )
+
+
+def test_skip():
+    data = updates().write() + b"next"
+    b = BytesIO(data)
+    TLObject.skip(b)
+
+    assert b.read() == b"next"
+
+
+def test_read_lazy():
+    data = updates().write()
+    result = TLObject.read_lazy(BytesIO(data))
+
+    assert isinstance(result, raw.types.Updates)
+    assert (result.date, result.seq) == (8, 0)
+    assert result._lazy[1].keys() == {"updates", "users", "chats"}
+
+    assert result.users[0].first_name == "user"
+    assert result._lazy[1].keys() == {"updates", "chats"}
+
+    assert result.write() == data
+    assert not hasattr(result, "_lazy")
+
+    with pytest.raises(AttributeError):
+        result.missing
+
+
+def test_read_lazy_threads():
+    data = updates().write()
+    expected = TLObject.read(BytesIO(data))
+
+    def access(result, name):
+        return getattr(result, name)
+
+    with ThreadPoolExecutor(3) as executor:
+        for _ in range(100):
+            result = TLObject.read_lazy(BytesIO(data))
+            fields = list(executor.map(access, [result] * 3, ["updates", "users", "chats"]))
+
+            assert fields == [expected.updates, expected.users, expected.chats]
+            assert not hasattr(result, "_lazy")
+
+
+def bare_vector_result(values: list, t) -> bytes:
+    """Return a message answering a request with a bare vector, as in contacts.GetContactIDs"""
+    body = Int(raw.types.RpcResult.ID, False) + Long(7) + Vector(values, t)
+
+    return Long(1) + Int(1) + Int(len(body)) + body
+
+
+@pytest.mark.parametrize("values, t, padding", [
+    ([1, 2, 3], Long, 12),
+    ([1, 2, 3], Int, 16),
+    ([2 ** 40, -1], Long, 16)
+])
+def test_bare_vector_result(values, t, padding):
+    message = bare_vector_result(values, t)
+
+    assert Message.read(BytesIO(message + bytes(padding))).body.result == values
+    assert Message.read_lazy(BytesIO(message + bytes(padding))).body.result == values
+
+    b = BytesIO(message + bytes(padding))
+    b.seek(32)
+    b.end = len(message)
+    Vector.skip(b)
+
+    assert b.tell() == len(message)
+
+    # Inside a container, followed by another message
+    container = MsgContainer([Message(raw.functions.Ping(ping_id=0), 2, 2, 0)]).write()
+    container = container[:4] + Int(2) + message + container[8:]
+
+    result = TLObject.read(BytesIO(container + bytes(padding)))
+
+    assert result.messages[0].body.result == values
+    assert result.messages[1].body.ping_id == 0
+
+
+def test_unknown_constructor():
+    unknown = bytes.fromhex("01020304") + b"data"
+    message = Message(raw.types.RpcResult(req_msg_id=7, result=raw.types.InputPeerSelf()), 1, 1, 0).write()
+    message = message[:-4] + unknown
+    message = message[:12] + Int(len(message) - 16) + message[16:]
+
+    result = Message.read(BytesIO(message + b"next"))
+
+    assert isinstance(result.body, raw.types.RpcResult)
+    assert result.body.req_msg_id == 7
+    assert isinstance(result.body.result, UnknownObject)
+    assert result.body.result.ID == 0x04030201
+    assert result.body.result.write() == unknown
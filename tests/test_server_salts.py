@@ -0,0 +1,130 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+import time
+
+import pytest
+
+from pyrogram.raw.core import FutureSalt
+from pyrogram.session import Session
+from pyrogram.storage import MemoryStorage, Storage
+
+AUTH_KEY = bytes(range(256))
+
+
+@pytest.mark.asyncio
+async def test_storage():
+    storage = MemoryStorage("test")
+    await storage.open()
+
+    now = int(time.time())
+
+    await storage.update_salts(2, [
+        (1, now - 7200, now - 3600),
+        (2, now - 60, now + 1800),
+        (-3, now + 1800, now + 3600)
+    ])
+    await storage.update_salts(4, [(4, now, now + 1800)])
+
+    assert await storage.get_salts(2) == [(2, now - 60, now + 1800), (-3, now + 1800, now + 3600)]
+
+    await storage.update_salts(2, [])
+
+    assert await storage.get_salts(2) == []
+    assert await storage.get_salts(4) == [(4, now, now + 1800)]
+
+    await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_rotate_salt(session):
+    now = int(time.time())
+
+    s = session()
+    s.future_salts = [
+        FutureSalt(now - 1800, now + 10, 1),
+        FutureSalt(now - 10, now + 1800, 2),
+        FutureSalt(now + 1800, now + 3600, 3)
+    ]
+
+    s.rotate_salt()
+
+    assert s.salt == 2
+    assert [salt.salt for salt in s.future_salts] == [2, 3]
+
+
+@pytest.mark.asyncio
+async def test_load_salts(session):
+    now = int(time.time())
+
+    storage = MemoryStorage("test")
+    await storage.open()
+    await storage.auth_key(AUTH_KEY)
+    await storage.update_salts(2, [(5, now - 10, now + 1800)])
+
+    s = session(storage)
+    await s.load_salts()
+    s.rotate_salt()
+
+    assert s.salt == 5
+
+    other_session = session(storage, bytes(256))
+    await other_session.load_salts()
+
+    assert other_session.future_salts == []
+
+    await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_storage_without_salts(session):
+    class CustomStorage(Storage):
+        async def auth_key(self, value: bytes = object):
+            return AUTH_KEY
+
+    storage = CustomStorage("test")
+    s = session(storage)
+
+    await s.load_salts()
+    await storage.update_salts(2, [(5, 0, 1)])
+
+    assert s.future_salts == []
+    assert await storage.get_salts(2) == []
+
+
+@pytest.mark.asyncio
+async def test_renew_salts(session):
+    now = int(time.time())
+    fetched = []
+
+    s = session()
+
+    async def fetch_salts():
+        fetched.append(True)
+
+    s.fetch_salts = fetch_salts
+    s.future_salts = [FutureSalt(now - 10, now + 2 * Session.FUTURE_SALTS_RENEW_THRESHOLD, 1)]
+
+    await s.renew_salts()
+
+    assert not fetched
+
+    s.future_salts = [FutureSalt(now - 10, now + 60, 1)]
+
+    await s.renew_salts()
+
+    assert fetched
@@ -0,0 +1,359 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from pyrogram import raw
+from pyrogram.errors import BadMsgNotification
+from pyrogram.raw.core import Message
+from pyrogram.session import Session
+from pyrogram.session.internals import MsgId, RttEstimator, TimerWheel
+
+
+async def receive(s: Session, body, msg_id: int = None):
+    """Let the session handle an incoming message as if it was decrypted from a packet"""
+    message = Message(body, msg_id or MsgId() + 1, 1, 0)
+
+    with patch("pyrogram.session.session.mtproto.unpack", lambda *args: message):
+        await s.handle_packet(b"")
+
+
+async def sent_msg_id(s: Session, count: int) -> int:
+    """Wait for the session to have sent count messages and return the id of the last one awaiting a response"""
+    while len(s.connection.sent) < count:
+        await asyncio.sleep(0)
+
+    return max(s.results)
+
+
+def test_msg_id(monkeypatch):
+    monkeypatch.setattr(MsgId, "server_time_offset", 0)
+    monkeypatch.setattr(MsgId, "last_msg_id", 0)
+
+    MsgId.set_server_time(time.time() + 100)
+    ahead = MsgId()
+
+    MsgId.set_server_time(time.time() - 100)
+    behind = MsgId()
+
+    # Small corrections keep ids increasing
+    MsgId.set_server_time(time.time() - 100.5)
+    next_behind = MsgId()
+
+    assert abs(ahead / 2 ** 32 - time.time() - 100) < 1
+    assert abs(behind / 2 ** 32 - time.time() + 100) < 1
+    assert ahead % 4 == behind % 4 == 0
+    assert next_behind > behind
+
+
+@pytest.mark.asyncio
+async def test_bad_msg_time_resend(monkeypatch, session):
+    monkeypatch.setattr(MsgId, "server_time_offset", 0)
+
+    s = session()
+    task = asyncio.create_task(s.send(raw.functions.Ping(ping_id=1)))
+    msg_id = await sent_msg_id(s, 1)
+
+    server_msg_id = int((time.time() + 1000) * 2 ** 32) | 1
+
+    # Once a first message is stored, a msg_id that far in the future would otherwise be discarded
+    await receive(s, raw.types.Pong(msg_id=0, ping_id=0))
+    await receive(s, raw.types.BadMsgNotification(bad_msg_id=msg_id, bad_msg_seqno=1, error_code=17), server_msg_id)
+
+    resent_msg_id = await sent_msg_id(s, 2)
+
+    assert abs(MsgId.server_time_offset - 1000) < 1
+    assert abs(resent_msg_id / 2 ** 32 - time.time() - 1000) < 1
+
+    await receive(s, raw.types.Pong(msg_id=resent_msg_id, ping_id=1))
+
+    assert (await task).ping_id == 1
+
+
+@pytest.mark.asyncio
+async def test_bad_msg_time_resend_once(monkeypatch, session):
+    monkeypatch.setattr(MsgId, "server_time_offset", 0)
+
+    s = session()
+    task = asyncio.create_task(s.send(raw.functions.Ping(ping_id=1)))
+
+    for count in (1, 2):
+        msg_id = await sent_msg_id(s, count)
+        await receive(s, raw.types.BadMsgNotification(bad_msg_id=msg_id, bad_msg_seqno=1, error_code=16))
+
+    with pytest.raises(BadMsgNotification):
+        await task
+
+    assert len(s.connection.sent) == 2
+
+
+@pytest.mark.asyncio
+async def test_send_ordered(monkeypatch, session):
+    monkeypatch.setattr(MsgId, "server_time_offset", 0)
+
+    s = session()
+    sent = []
+
+    async def send_message(message):
+        sent.append(message)
+
+    s.send_message = send_message
+
+    results = await s.send_ordered([raw.functions.Ping(ping_id=i) for i in range(3)])
+    tasks = [asyncio.ensure_future(r) for r in results]
+
+    # All requests are numbered at once and sent in one container, each executed after the previous one
+    assert len(sent) == 1
+    messages = sent[0].body.messages
+
+    assert [m.msg_id for m in messages] == sorted(m.msg_id for m in messages)
+    assert [m.seq_no for m in messages] == sorted(m.seq_no for m in messages)
+    assert [m.body.msg_id for m in messages[1:]] == [m.msg_id for m in messages[:-1]]
+
+    await receive(s, raw.types.Pong(msg_id=messages[0].msg_id, ping_id=0))
+    await receive(s, raw.types.BadMsgNotification(bad_msg_id=messages[1].msg_id, bad_msg_seqno=1, error_code=32))
+
+    assert (await tasks[0]).ping_id == 0
+
+    with pytest.raises(BadMsgNotification):
+        await tasks[1]
+
+    # Chained requests the server didn't receive aren't sent again under a new msg_id after a reconnection
+    resend = asyncio.create_task(s.resend([s.results[messages[2].msg_id]]))
+
+    while len(sent) < 2:
+        await asyncio.sleep(0)
+
+    await receive(s, raw.types.MsgsStateInfo(req_msg_id=sent[1].msg_id, info=bytes([1])))
+    await resend
+
+    with pytest.raises(ConnectionError):
+        await tasks[2]
+
+    assert len(sent) == 2
+
+
+@pytest.mark.asyncio
+async def test_resend_pending(session):
+    s = session()
+    sent = []
+
+    async def send_message(message):
+        sent.append(message)
+
+    s.send_message = send_message
+
+    tasks = [asyncio.create_task(s.send(raw.functions.Ping(ping_id=i))) for i in range(3)]
+
+    while len(sent) < 3:
+        await asyncio.sleep(0)
+
+    msg_ids = [m.msg_id for m in sent]
+
+    # Connection lost before the responses: the server is asked what it received before anything is sent again
+    resend = asyncio.create_task(s.resend(sorted(s.results.values(), key=lambda r: r.msg_id)))
+
+    while len(sent) < 4:
+        await asyncio.sleep(0)
+
+    assert sent[3].body.msg_ids == msg_ids
+
+    # Not received, received and being processed, received and answered
+    await receive(s, raw.types.MsgsStateInfo(req_msg_id=sent[3].msg_id, info=bytes([1, 4 | 32, 4 | 64])))
+    await resend
+
+    assert sent[4].body.ping_id == 0
+    assert sent[5].body.msg_ids == [msg_ids[2]]
+    assert len(sent) == 6
+    assert set(s.results) == {sent[4].msg_id, msg_ids[1], msg_ids[2]}
+
+    for msg_id, ping_id in ((sent[4].msg_id, 0), (msg_ids[1], 1), (msg_ids[2], 2)):
+        await receive(s, raw.types.Pong(msg_id=msg_id, ping_id=ping_id))
+
+    assert [(await task).ping_id for task in tasks] == [0, 1, 2]
+    assert not s.results
+
+
+def test_rtt_estimator():
+    rtt = RttEstimator()
+
+    assert rtt.timeout() is None
+
+    rtt.update(1)
+
+    assert rtt.timeout() == 3
+
+    for _ in range(100):
+        rtt.update(0.2)
+
+    assert abs(rtt.srtt - 0.2) < 0.01
+    assert rtt.timeout() < 0.3
+
+
+@pytest.mark.asyncio
+async def test_adaptive_timeouts(session):
+    s = session()
+
+    assert s.request_timeout() == Session.WAIT_TIMEOUT
+    assert s.retry_delay(0) == Session.RETRY_DELAY
+
+    task = asyncio.create_task(s.send(raw.functions.Ping(ping_id=1)))
+    msg_id = await sent_msg_id(s, 1)
+    await receive(s, raw.types.Pong(msg_id=msg_id, ping_id=1))
+    await task
+
+    # A fast link doesn't shorten timeouts, as slow server side calls would be timed out and sent again,
+    # and file parts are given time to be transferred
+    assert s.rtt.srtt is not None
+    assert s.request_timeout() == Session.MIN_WAIT_TIMEOUT == Session.WAIT_TIMEOUT
+    assert s.ping_timeout() == Session.MIN_PING_TIMEOUT < Session.WAIT_TIMEOUT
+    assert s.request_timeout(1024 * 1024) == Session.MIN_WAIT_TIMEOUT + 1024 * 1024 / Session.MIN_THROUGHPUT
+    assert s.ping_interval() == Session.PING_INTERVAL
+    assert s.retry_delay(0) < Session.RETRY_DELAY
+    assert s.retry_delay(100) == Session.MAX_RETRY_DELAY
+
+    s.rtt.update(100)
+
+    assert s.ping_interval() == Session.MAX_PING_INTERVAL
+    assert s.request_timeout() == Session.MAX_WAIT_TIMEOUT
+    assert s.ping_timeout() == Session.MAX_WAIT_TIMEOUT
+
+
+@pytest.mark.asyncio
+async def test_timer_wheel():
+    wheel = TimerWheel(0.01)
+    fired = []
+
+    wheel.add(0.02, lambda: fired.append(1))
+    removed = wheel.add(0.02, lambda: fired.append(2))
+    wheel.add(0.05, lambda: fired.append(3))
+    wheel.remove(removed)
+
+    await asyncio.sleep(0.03)
+
+    assert fired == [1]
+
+    await asyncio.sleep(0.05)
+
+    assert fired == [1, 3]
+    assert len(wheel) == 0
+    assert wheel.handle is None
+
+
+@pytest.mark.asyncio
+async def test_gzip_file_parts(monkeypatch, session):
+    thresholds = []
+    monkeypatch.setattr("pyrogram.session.session.mtproto.pack", lambda *args: thresholds.append(args[-1]) or b"")
+
+    s = session()
+    part = raw.functions.upload.SaveFilePart(file_id=1, file_part=0, bytes=b"x" * 4096)
+
+    await s.send_message(s.msg_factory(raw.functions.messages.GetDialogFilters()))
+    await s.send_message(s.msg_factory(part))
+    await s.send_message(s.msg_factory(raw.functions.InvokeWithoutUpdates(query=part)))
+
+    assert thresholds == [Session.GZIP_THRESHOLD, 0, 0]
+
+
+@pytest.mark.asyncio
+async def test_send_timeout(session):
+    s = session()
+    s.timers = TimerWheel(0.01)
+
+    with pytest.raises(TimeoutError):
+        await s.send(raw.functions.Ping(ping_id=1), timeout=0.02)
+
+    assert not s.results
+    assert len(s.timers) == 0
+
+
+@pytest.mark.asyncio
+async def test_send_cancel(session):
+    s = session()
+    task = asyncio.create_task(s.send(raw.functions.Ping(ping_id=1)))
+    await sent_msg_id(s, 1)
+
+    task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert not s.results
+    assert len(s.timers) == 0
+
+
+@pytest.mark.asyncio
+async def test_send_cancel_while_packing(session):
+    s = session()
+    packing = asyncio.Event()
+
+    async def send_message(message):
+        packing.set()
+        await asyncio.sleep(10)
+
+    s.send_message = send_message
+
+    for send in (s.send(raw.functions.Ping(ping_id=1)), s.send_ordered([raw.functions.Ping(ping_id=2)])):
+        packing.clear()
+        task = asyncio.create_task(send)
+        await packing.wait()
+
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert not s.results
+
+
+@pytest.mark.asyncio
+async def test_drop_answers(session):
+    s = session()
+    s.is_started.set()
+
+    sent = []
+    send_message = s.send_message
+
+    async def record(message):
+        sent.append(message)
+        await send_message(message)
+
+    s.send_message = record
+
+    tasks = [asyncio.create_task(s.send(raw.functions.Ping(ping_id=i))) for i in range(2)]
+    await sent_msg_id(s, 2)
+    msg_ids = sorted(s.results)
+
+    for task in tasks:
+        task.cancel()
+
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    while len(sent) < 3:
+        await asyncio.sleep(0)
+
+    # Both answers are dropped at once
+    assert len(sent) == 3
+    assert [m.body.req_msg_id for m in sent[2].body.messages] == msg_ids
+    assert not s.results
+
+    # A late answer is ignored
+    await receive(s, raw.types.Pong(msg_id=msg_ids[0], ping_id=0))
@@ -0,0 +1,43 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import pytest
+
+from pyrogram import raw
+
+
+@pytest.mark.asyncio
+async def test_least_loaded(client, fake_session):
+    main, idle, busy, stopped = fake_session(2), fake_session(0), fake_session(5), fake_session(0, started=False)
+
+    await client(main, [busy, stopped, idle]).invoke(raw.functions.help.GetConfig())
+
+    assert not main.queries and not busy.queries and not stopped.queries
+    assert isinstance(idle.queries[0], raw.functions.InvokeWithoutUpdates)
+    assert isinstance(idle.queries[0].query, raw.functions.help.GetConfig)
+
+
+@pytest.mark.asyncio
+async def test_main_session_preferred(client, fake_session):
+    main, pooled = fake_session(1), fake_session(1)
+
+    await client(main, [pooled]).invoke(raw.functions.help.GetConfig())
+
+    assert not pooled.queries
+    assert isinstance(main.queries[0], raw.functions.help.GetConfig)
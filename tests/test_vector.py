@@ -0,0 +1,55 @@
+#  Pyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of Pyrogram.
+#
+#  Pyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  Pyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with Pyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+
+from io import BytesIO
+
+from pyrogram import raw
+from pyrogram.raw.core import TLObject, Vector, Int, Long
+
+
+def test_bare_result():
+    for t, values in ((Int, [1, 2, 3]), (Long, [1 << 40, 2, 3])):
+        b = BytesIO(Vector(values, t))
+
+        assert TLObject.read(b) == values
+        assert b.read() == b""
+
+
+def test_nested():
+    messages = raw.types.messages.Messages(
+        messages=[
+            raw.types.Message(
+                id=i,
+                peer_id=raw.types.PeerUser(user_id=1),
+                date=0,
+                message="hello",
+                entities=[raw.types.MessageEntityBold(offset=0, length=5)] * i
+            ) for i in range(1, 4)
+        ],
+        chats=[],
+        users=[raw.types.User(id=1, access_hash=0)]
+    )
+
+    data = messages.write()
+    b = BytesIO(data + b"trailing")
+    r = TLObject.read(b)
+
+    assert r.write() == data
+    assert [len(m.entities) for m in r.messages] == [1, 2, 3]
+    assert b.read() == b"trailing"